@@ -23,9 +23,10 @@ from components.app_components import (
 )
 from components.sidebar import render_sidebar
 from data_creation.data_operations import handle_generate_button_click
-import json
+import orjson
 from dotenv import load_dotenv
 from data_creation.dev_config import load_dev_endpoints, load_dev_gen_templates
+from data_creation.template_generator import set_template_content
 
 
 def _sync_generator_to_session_templates(template_generator):
@@ -37,13 +38,10 @@ def _sync_generator_to_session_templates(template_generator):
         template_generator: TemplateGenerator instance with templates to sync
     """
     for template_name, template_content in template_generator.generation_templates.items():
-        # Create session state key for this template
-        content_key = f"template_content_{template_name}"
-        
         # Convert template content to JSON string and store in session state
         try:
-            template_json = json.dumps(template_content, indent=2)
-            st.session_state[content_key] = template_json
+            template_json = orjson.dumps(template_content, option=orjson.OPT_INDENT_2).decode()
+            set_template_content(template_name, template_json)
         except Exception as e:
             print(f"Warning: Could not sync template {template_name} to session state: {e}")
             continue
@@ -6,6 +6,7 @@ import streamlit as st
 from streamlit_ace import st_ace
 
 import json
+import orjson
 import os
 import pandas as pd
 from datetime import datetime
@@ -262,7 +263,7 @@ def _update_main_template_from_editor(selected_template: str, editor_content:str
     try:
         main_key = f"main_template_{selected_template}"
         try:
-            parsed_template = json.loads(editor_content)
+            parsed_template = orjson.loads(editor_content)
             
             # Basic validation
             if isinstance(parsed_template, dict):
@@ -274,7 +275,7 @@ def _update_main_template_from_editor(selected_template: str, editor_content:str
                     template_generator = st.session_state.data_gen.get_template_generator()
                     template_generator.generation_templates[selected_template] = parsed_template
                     
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             # Invalid JSON, don't update
             pass
             
@@ -382,7 +383,7 @@ def _sync_editor_from_main(selected_template: str):
         return
         
     main_template = st.session_state[main_key]
-    editor_content = json.dumps(main_template, indent=2)
+    editor_content = orjson.dumps(main_template, option=orjson.OPT_INDENT_2).decode()
     st.session_state[editor_key] = editor_content
 
 
@@ -545,13 +546,13 @@ def render_template_editor(data_gen, selected_template: str) -> Dict[str, Any]:
         parsed_template = {}
         
         try:
-            parsed_template = json.loads(current_editor_content)
+            parsed_template = orjson.loads(current_editor_content)
             st.success("✅ Valid JSON syntax")
             
             # Check generation template structure
             expected_keys = ["StaticFields", "SequenceFields", "RandomFields", "LinkedFields", "ArrayLengths"]
                             
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             st.error(f"❌ JSON syntax error: {str(e)}")
             template_valid = False
             parsed_template = st.session_state.get(main_key, {})
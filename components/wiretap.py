@@ -6,6 +6,7 @@ import json
 import time
 from pandas import DataFrame, read_csv
 import io
+import threading
 
 logger = logging.getLogger(__name__)
 
@@ -33,8 +34,19 @@ def query_execution_wrapper(url, headers, query):
     return df
 
 
+# Query ids are millisecond timestamps, the lock keeps queries submitted in parallel from sharing one
+_query_id_lock = threading.Lock()
+_last_query_id = ''
+
 def get_current_datetime_string():
-    return datetime.now().strftime("%Y%m%d%H%M%S%f")[:-3]
+    global _last_query_id
+    with _query_id_lock:
+        query_id = datetime.now().strftime("%Y%m%d%H%M%S%f")[:-3]
+        while query_id <= _last_query_id:
+            time.sleep(0.001)
+            query_id = datetime.now().strftime("%Y%m%d%H%M%S%f")[:-3]
+        _last_query_id = query_id
+    return query_id
 
 def save_query(url, headers, query):
     queryId = get_current_datetime_string()
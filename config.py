@@ -1,5 +1,6 @@
 import streamlit as st
 import json
+from copy import deepcopy
 """
 Configuration constants for the Data Creation Tool
 """
@@ -37,21 +38,27 @@ TEMPLATE_DEFAULTS = {
 }
 
 
+@st.cache_resource(show_spinner=False)
+def _load_config_file(config_file):
+    """Read and parse the config file once per process; callers must not mutate the result."""
+    with open(config_file, 'r') as f:
+        return json.load(f)
+
+
 def load_initial_config_to_session(config_file='configuration.json'):
     """Load initial config from file into session_state if not already loaded."""
     if not st.session_state.get('config_loaded', False):
         try:
-            with open(config_file, 'r') as f:
-                config_data = json.load(f)
-                # Load endpoints
-                endpoints = config_data.get('endpoints', {})
-                st.session_state['user_endpoint_config'] = endpoints
-                # Load environment/global settings
-                st.session_state['base_url'] = config_data.get('base_url', '')
-                headers = config_data.get('headers', {})
-                st.session_state['shared_token'] = headers.get('Authorization', '')
-                st.session_state['selected_organization'] = headers.get('SelectedOrganization', '')
-                st.session_state['selected_location'] = headers.get('SelectedLocation', '')
+            config_data = _load_config_file(config_file)
+            # Load endpoints (copied so session edits never touch the shared config)
+            endpoints = deepcopy(config_data.get('endpoints', {}))
+            st.session_state['user_endpoint_config'] = endpoints
+            # Load environment/global settings
+            st.session_state['base_url'] = config_data.get('base_url', '')
+            headers = config_data.get('headers', {})
+            st.session_state['shared_token'] = headers.get('Authorization', '')
+            st.session_state['selected_organization'] = headers.get('SelectedOrganization', '')
+            st.session_state['selected_location'] = headers.get('SelectedLocation', '')
 
             theme = st.get_option("theme.base")
             try:
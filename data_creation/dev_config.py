@@ -1,8 +1,10 @@
 import os
-import json
+import orjson
 import streamlit as st
 from dotenv import dotenv_values
 
+from data_creation.template_generator import set_template_content
+
 
 def is_dev_mode():
     config = dotenv_values('.env')
@@ -14,9 +16,9 @@ def get_dev_endpoints():
     """Get development endpoints from dev_endpoints.json"""
     try:
         if os.path.exists('dev_endpoints.json'):
-            with open('dev_endpoints.json', 'r') as f:
-                return json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError, IOError):
+            with open('dev_endpoints.json', 'rb') as f:
+                return orjson.loads(f.read())
+    except (orjson.JSONDecodeError, FileNotFoundError, IOError):
         pass
     return {}
 
@@ -24,8 +26,8 @@ def get_dev_templates():
     """Get development templates from dev_gen_templates.json"""
     try:
         if os.path.exists('dev_gen_templates.json'):
-            with open('dev_gen_templates.json', 'r') as f:
-                data = json.load(f)
+            with open('dev_gen_templates.json', 'rb') as f:
+                data = orjson.loads(f.read())
                 
                 # Handle the structure with templates array
                 if 'templates' in data and isinstance(data['templates'], list):
@@ -37,7 +39,7 @@ def get_dev_templates():
                 
                 # Fallback: return as-is if different structure
                 return data
-    except (json.JSONDecodeError, FileNotFoundError, IOError):
+    except (orjson.JSONDecodeError, FileNotFoundError, IOError):
         pass
     return {}
 
@@ -100,10 +102,9 @@ def load_dev_gen_templates():
                     st.session_state[template_generator.session_key][template_name] = template_content
                 
                 # Also create content key for editor
-                content_key = f"template_content_{template_name}"
                 try:
-                    template_json = json.dumps(template_content, indent=2)
-                    st.session_state[content_key] = template_json
+                    template_json = orjson.dumps(template_content, option=orjson.OPT_INDENT_2).decode()
+                    set_template_content(template_name, template_json)
                 except Exception as e:
                     continue
             
@@ -5,13 +5,16 @@ History database operations for tracking template generations
 import sqlite3
 import json
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional
 import os
 
 
 class HistoryDB:
     """Database handler for tracking generation history"""
     
+    # Hard cap on a single get_history page; full reads go through iter_history
+    MAX_PAGE_SIZE = 500
+    
     def __init__(self, db_path: str = "history.db"):
         """
         Initialize the history database
@@ -22,10 +25,18 @@ class HistoryDB:
         self.db_path = db_path
         self._init_database()
     
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection; WAL makes synchronous=NORMAL safe and faster for frequent small commits"""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+    
     def _init_database(self):
         """Initialize the database with required tables"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
+            # WAL is persistent, readers no longer block on the generation writer
+            cursor.execute("PRAGMA journal_mode=WAL")
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS generation_history (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -37,6 +48,11 @@ class HistoryDB:
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             """)
+            # Backs the newest-first ordering and keyset pagination
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_hist_dt_id 
+                ON generation_history(generation_datetime, id)
+            """)
             conn.commit()
     
     def save_generation_record(self, 
@@ -59,7 +75,7 @@ class HistoryDB:
         generation_datetime = datetime.now().isoformat()
         template_json = json.dumps(template_content, indent=2)
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 INSERT INTO generation_history 
@@ -71,16 +87,17 @@ class HistoryDB:
     
     def get_history(self, limit: int = 100, template_name: str = None) -> List[Dict[str, Any]]:
         """
-        Retrieve generation history records
+        Retrieve the most recent generation history records
         
         Args:
-            limit: Maximum number of records to return
+            limit: Maximum number of records to return, capped at MAX_PAGE_SIZE
             template_name: Optional filter by template name
             
         Returns:
             List of history records as dictionaries
         """
-        with sqlite3.connect(self.db_path) as conn:
+        limit = min(limit, self.MAX_PAGE_SIZE)
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row  # Enable column access by name
             cursor = conn.cursor()
             
@@ -88,19 +105,71 @@ class HistoryDB:
                 cursor.execute("""
                     SELECT * FROM generation_history 
                     WHERE template_name = ?
-                    ORDER BY created_at DESC 
+                    ORDER BY generation_datetime DESC, id DESC 
                     LIMIT ?
                 """, (template_name, limit))
             else:
                 cursor.execute("""
                     SELECT * FROM generation_history 
-                    ORDER BY created_at DESC 
+                    ORDER BY generation_datetime DESC, id DESC 
+                    LIMIT ?
+                """, (limit,))
+            
+            rows = cursor.fetchall()
+            return [dict(row) for row in rows]
+    
+    def get_history_after(self, last_dt: Optional[str] = None, last_id: Optional[int] = None,
+                          limit: int = 1000) -> List[Dict[str, Any]]:
+        """
+        Retrieve the records that follow a given record in newest-first order (keyset pagination)
+        
+        Args:
+            last_dt: generation_datetime of the last record already read, None to start from the newest
+            last_id: id of the last record already read
+            limit: Maximum number of records to return
+            
+        Returns:
+            List of history records as dictionaries
+        """
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            
+            if last_dt is None:
+                cursor.execute("""
+                    SELECT * FROM generation_history 
+                    ORDER BY generation_datetime DESC, id DESC 
                     LIMIT ?
                 """, (limit,))
+            else:
+                cursor.execute("""
+                    SELECT * FROM generation_history 
+                    WHERE (generation_datetime, id) < (?, ?)
+                    ORDER BY generation_datetime DESC, id DESC 
+                    LIMIT ?
+                """, (last_dt, last_id, limit))
             
             rows = cursor.fetchall()
             return [dict(row) for row in rows]
     
+    def iter_history(self, chunk_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        Yield every generation history record, newest first, fetching chunk_size rows at a time
+        
+        Args:
+            chunk_size: Number of records fetched per query
+            
+        Yields:
+            History records as dictionaries
+        """
+        last_dt, last_id = None, None
+        while True:
+            rows = self.get_history_after(last_dt, last_id, limit=chunk_size)
+            yield from rows
+            if len(rows) < chunk_size:
+                return
+            last_dt, last_id = rows[-1]['generation_datetime'], rows[-1]['id']
+    
     def get_template_usage_stats(self) -> List[Dict[str, Any]]:
         """
         Get usage statistics for templates
@@ -108,7 +177,7 @@ class HistoryDB:
         Returns:
             List of template usage statistics
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             cursor.execute("""
@@ -141,7 +210,7 @@ class HistoryDB:
         cutoff_date = cutoff_date.replace(day=cutoff_date.day - days_old)
         cutoff_str = cutoff_date.isoformat()
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 DELETE FROM generation_history 
@@ -5,13 +5,46 @@ Provides utility functions for accessing stored query results in template genera
 
 import streamlit as st
 import pandas as pd
-from typing import Optional, List, Dict, Any
+import pyarrow as pa
+from datetime import datetime
+from typing import Optional, List, Dict, Any, NamedTuple, Tuple
+
+
+class QueryEntry(NamedTuple):
+    """A stored query result and the metadata derived from it when it was stored"""
+    table: pa.Table
+    preview: pa.Table
+    created_at: datetime
+    row_count: int
+    col_count: int
+    columns: Tuple[str, ...]
+    # Column value -> first row position, filled in on first match mode lookup of a column
+    indexes: Dict[str, Dict[Any, int]]
+    # Pandas view of table, materialized by get_query_dataframe
+    frames: Dict[str, pd.DataFrame]
+    sql: Optional[str]
+    organization: Optional[str]
+
+
+def arrow_types_mapper(arrow_type: pa.DataType) -> Optional[pd.ArrowDtype]:
+    """
+    Types mapper for Table.to_pandas, keeping columns Arrow-backed
+    
+    Dictionary-encoded columns are left to pyarrow's default conversion so they come
+    back as pandas categoricals, which pandas can round-trip through Arrow metadata.
+    """
+    if pa.types.is_dictionary(arrow_type):
+        return None
+    return pd.ArrowDtype(arrow_type)
 
 
 def get_query_dataframe(query_name: str) -> Optional[pd.DataFrame]:
     """
     Get a stored query result DataFrame by name
     
+    The result is stored as an Arrow table; the first call materializes an Arrow-backed
+    pandas view that shares the table's buffers and keeps it for later calls.
+    
     Args:
         query_name: Name of the stored query result
         
@@ -21,11 +54,55 @@ def get_query_dataframe(query_name: str) -> Optional[pd.DataFrame]:
     query_dataframes = st.session_state.get('query_dataframes', {})
     
     if query_name in query_dataframes:
-        return query_dataframes[query_name]['dataframe']
+        frames = query_dataframes[query_name].frames
+        if 'full' not in frames:
+            frames['full'] = query_dataframes[query_name].table.to_pandas(types_mapper=arrow_types_mapper)
+        return frames['full']
     
     return None
 
 
+def build_column_index(values: List[Any]) -> Dict[Any, int]:
+    """
+    Build a value -> row position lookup, keeping the first row for repeated values
+    
+    Args:
+        values: Column values in row order
+        
+    Returns:
+        Dictionary mapping each value to the position of its first row
+    """
+    index = {}
+    for position, value in enumerate(values):
+        index.setdefault(value, position)
+    return index
+
+
+def get_query_index(query_name: str, column_name: str) -> Optional[Dict[Any, int]]:
+    """
+    Get the value -> row position index of a column in a stored query result
+    
+    Indexes are built once, at store time for declared key columns or on first use
+    otherwise, and kept beside the stored table so match mode lookups are O(1).
+    
+    Args:
+        query_name: Name of the stored query result
+        column_name: Name of the column to index
+        
+    Returns:
+        Dictionary mapping column values to their first row position, None if query not found
+    """
+    query_dataframes = st.session_state.get('query_dataframes', {})
+    
+    if query_name not in query_dataframes:
+        return None
+    
+    indexes = query_dataframes[query_name].indexes
+    if column_name not in indexes:
+        indexes[column_name] = build_column_index(query_dataframes[query_name].table.column(column_name).to_pylist())
+    return indexes[column_name]
+
+
 def list_available_queries() -> List[str]:
     """
     Get a list of all available query result names
@@ -45,14 +122,22 @@ def get_query_info(query_name: str) -> Optional[Dict[str, Any]]:
         query_name: Name of the stored query result
         
     Returns:
-        Dictionary with query metadata (row_count, columns, created_at, etc.)
+        Dictionary with query metadata (row_count, columns, created_at, etc.), use
+        get_query_dataframe for the rows themselves
     """
-    query_dataframes = st.session_state.get('query_dataframes', {})
+    query_info = st.session_state.get('query_dataframes', {}).get(query_name)
     
-    if query_name in query_dataframes:
-        return query_dataframes[query_name]
+    if query_info is None:
+        return None
     
-    return None
+    return {
+        'row_count': query_info.row_count,
+        'column_count': query_info.col_count,
+        'columns': list(query_info.columns),
+        'created_at': query_info.created_at,
+        'sql': query_info.sql,
+        'organization': query_info.organization
+    }
 
 
 def sample_from_query(query_name: str, n: int = 1) -> Optional[pd.DataFrame]:
@@ -184,11 +269,10 @@ def get_query_summary() -> Dict[str, Dict[str, Any]]:
     
     for query_name, query_info in query_dataframes.items():
         summary[query_name] = {
-            'row_count': query_info['row_count'],
-            'column_count': len(query_info['columns']),
-            'columns': query_info['columns'],
-            'created_at': query_info['created_at'],
-            'query_time': query_info['query_time']
+            'row_count': query_info.row_count,
+            'column_count': query_info.col_count,
+            'columns': list(query_info.columns),
+            'created_at': query_info.created_at
         }
     
     return summary
@@ -17,6 +17,7 @@ from copy import deepcopy
 # Import query context utilities for template generation
 from data_creation.query_context_utils import (
     get_query_dataframe, 
+    get_query_index,
     sample_from_query, 
     get_random_value_from_column,
     get_unique_column_values,
@@ -1471,11 +1472,10 @@ def apply_query_context_field(record: Dict[str, Any], field_name: str, query_spe
             if df is None or df.empty:
                 return
                 
-            # Find row where query_key column matches template_value
-            matching_rows = df[df[query_key] == template_value]
-            if not matching_rows.empty:
-                # Use the first matching row
-                value = matching_rows[column_name].iloc[0]
+            # Find the first row where query_key column matches template_value
+            row_position = get_query_index(query_name, query_key).get(template_value)
+            if row_position is not None:
+                value = df[column_name].iloc[row_position]
                 # Convert NaN to None
                 if isinstance(value, float) and math.isnan(value):
                     value = None
@@ -4,7 +4,7 @@ Interprets generation templates to create randomized data with controlled patter
 Session-only storage - loads example generation templates on startup
 """
 
-import json
+import orjson
 import os
 import glob
 import streamlit as st
@@ -18,6 +18,37 @@ from termcolor import colored
 init(autoreset=True)
 just_fix_windows_console()
 
+# Editor JSON of a generation template lives under this prefix plus the template name
+TEMPLATE_CONTENT_PREFIX = "template_content_"
+# Names with editor JSON in session state, so readers never scan every session key
+TEMPLATE_CONTENT_INDEX_KEY = "generation_template_content_names"
+# Names whose editor JSON was written since it was last synced back to the generator
+TEMPLATE_CONTENT_DIRTY_KEY = "generation_template_content_dirty"
+
+
+def set_template_content(template_name: str, template_json: str):
+    """Store a generation template's editor JSON in session state, index its name and mark it dirty"""
+    st.session_state[f"{TEMPLATE_CONTENT_PREFIX}{template_name}"] = template_json
+    st.session_state.setdefault(TEMPLATE_CONTENT_INDEX_KEY, set()).add(template_name)
+    st.session_state.setdefault(TEMPLATE_CONTENT_DIRTY_KEY, set()).add(template_name)
+
+
+def remove_template_content(template_name: str):
+    """Drop a generation template's editor JSON from session state and from the name index"""
+    st.session_state.pop(f"{TEMPLATE_CONTENT_PREFIX}{template_name}", None)
+    st.session_state.get(TEMPLATE_CONTENT_INDEX_KEY, set()).discard(template_name)
+    st.session_state.get(TEMPLATE_CONTENT_DIRTY_KEY, set()).discard(template_name)
+
+
+def get_template_content_names() -> List[str]:
+    """Names of the generation templates whose editor JSON is in session state"""
+    return list(st.session_state.get(TEMPLATE_CONTENT_INDEX_KEY, ()))
+
+
+def get_dirty_template_content_names() -> set:
+    """Live set of names written since their last sync, the syncing caller discards what it handled"""
+    return st.session_state.setdefault(TEMPLATE_CONTENT_DIRTY_KEY, set())
+
 
 class TemplateGenerator:
     """Generates data based on generation template specifications - session only with examples"""
@@ -48,9 +79,8 @@ class TemplateGenerator:
         
         for file_path in template_files:
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    template_data = json.loads(content)
+                with open(file_path, 'rb') as f:
+                    template_data = orjson.loads(f.read())
                     
                 # Use filename (without extension) as template name
                 template_name = os.path.splitext(os.path.basename(file_path))[0]
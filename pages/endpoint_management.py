@@ -5,7 +5,9 @@ Dedicated page for managing API endpoint configurations
 """
 
 import json
+from functools import partial
 
+import orjson
 import streamlit as st
 from components.endpoint_config_ui import render_template_endpoint_config
 from components.sidebar import render_sidebar, mark_config_updated
@@ -106,7 +108,13 @@ def render_environment_configuration():
 def render_template_configuration_section():
     """Render template-specific configuration section (session_state only)"""
     user_config = st.session_state.get('user_endpoint_config', {})
-    available_templates = sorted(user_config.keys())
+    # Re-sorted only when the set of configured templates changes
+    names = tuple(user_config)
+    cached_names = st.session_state.get('endpoint_template_names_sorted')
+    if cached_names is None or cached_names[0] != names:
+        cached_names = (names, sorted(names))
+        st.session_state['endpoint_template_names_sorted'] = cached_names
+    available_templates = cached_names[1]
     if available_templates:
         selected_template = st.selectbox(
             "Select Template to Configure",
@@ -136,7 +144,7 @@ def render_import_export_section():
     }
     st.download_button(
         label="💾 Download Full Config",
-        data=json.dumps(export_data, indent=2),
+        data=partial(json.dumps, export_data, indent=2),
         file_name="ma_data_creator_config.json",
         mime="application/json",
         help="Download the full configuration including all endpoints and environment settings"
@@ -157,8 +165,8 @@ def render_import_export_section():
     if uploaded_file is not None:
         if st.session_state.last_processed_file != uploaded_file.file_id:
             try:
-                config_content = uploaded_file.read().decode('utf-8')
-                config_data = json.loads(config_content)
+                # orjson parses the upload buffer in place, no bytes or decoded str copy of the file
+                config_data = orjson.loads(uploaded_file.getbuffer())
                 
                 # Load environment
                 if 'base_url' in config_data:
@@ -179,7 +187,7 @@ def render_import_export_section():
                 
                 st.success("✅ Configuration imported successfully!")
                 st.rerun()
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 st.error("❌ Invalid JSON file format")
             except Exception as e:
                 st.error(f"❌ Error reading file: {e}")
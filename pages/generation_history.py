@@ -5,23 +5,41 @@ Shows the history of template generations stored in the history database
 
 import streamlit as st
 import pandas as pd
-import json
+import csv
+import io
+import orjson
 from datetime import datetime
 from typing import Dict, Any
 
 from components.sidebar import render_sidebar
 from data_creation.history_db import get_history_db
+from data_creation.template_generator import set_template_content
 from config import load_initial_config_to_session
 
+# Detailed history rows shown by default and added per "Load more" click
+HISTORY_PAGE_SIZE = 25
+# Largest page the detailed history can request, bigger reads go through the export
+HISTORY_MAX_LIMIT = 200
+
+
+@st.cache_resource
+def _db():
+    """History database handle shared across reruns and sessions"""
+    return get_history_db()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_usage_stats():
+    """Template usage statistics, cached briefly so tab switches and filter changes skip the aggregate query"""
+    return _db().get_template_usage_stats()
+
 
 def render_history_overview():
     """Render overview statistics and recent history"""
     st.header("📊 Generation History Overview")
     
-    history_db = get_history_db()
-    
     # Get usage statistics
-    stats = history_db.get_template_usage_stats()
+    stats = _cached_usage_stats()
     
     if not stats:
         st.info("No generation history found yet. Start generating data to see history here!")
@@ -55,44 +73,55 @@ def render_history_overview():
     # Template usage table
     st.subheader("📋 Template Usage Details")
     
-    # Format the data for display
+    # Numbers stay numeric (sortable, smaller payload) and are formatted on the client
     display_df = stats_df.copy()
-    display_df['total_records_generated'] = display_df['total_records_generated'].apply(lambda x: f"{x:,}")
-    display_df['avg_records_per_generation'] = display_df['avg_records_per_generation'].apply(lambda x: f"{x:.1f}")
-    display_df['last_used'] = pd.to_datetime(display_df['last_used']).dt.strftime('%Y-%m-%d %H:%M:%S')
-    
-    # Rename columns for display
-    display_df = display_df.rename(columns={
-        'template_name': 'Template Name',
-        'usage_count': 'Times Used',
-        'total_records_generated': 'Total Records',
-        'last_used': 'Last Used',
-        'avg_records_per_generation': 'Avg Records/Gen'
-    })
-    
-    st.dataframe(display_df, use_container_width=True)
+    display_df['last_used'] = pd.to_datetime(display_df['last_used'], format='ISO8601')
+    
+    st.dataframe(
+        display_df,
+        use_container_width=True,
+        column_config={
+            'template_name': st.column_config.TextColumn("Template Name"),
+            'usage_count': st.column_config.NumberColumn("Times Used"),
+            'total_records_generated': st.column_config.NumberColumn("Total Records", format="localized"),
+            'last_used': st.column_config.DatetimeColumn("Last Used", format="YYYY-MM-DD HH:mm:ss"),
+            'avg_records_per_generation': st.column_config.NumberColumn("Avg Records/Gen", format="%.1f")
+        }
+    )
+
+
+@st.cache_data(show_spinner=False)
+def _parsed_template(record_id: int, raw: str):
+    """Parsed template content of a history record; records never change once written"""
+    return orjson.loads(raw)
+
+
+def _load_more_history():
+    """Grow the detailed history page by another HISTORY_PAGE_SIZE records"""
+    st.session_state['history_limit'] = min(st.session_state['history_limit'] + HISTORY_PAGE_SIZE, HISTORY_MAX_LIMIT)
 
 
 def render_detailed_history():
     """Render detailed history with filters"""
     st.header("📝 Detailed Generation History")
     
-    history_db = get_history_db()
+    history_db = _db()
     
     # Filters
     col1, col2 = st.columns(2)
     
     with col1:
         # Template filter
-        stats = history_db.get_template_usage_stats()
+        stats = _cached_usage_stats()
         template_names = ['All'] + [stat['template_name'] for stat in stats]
         selected_template = st.selectbox("Filter by Template", template_names)
     
     with col2:
-        # Limit filter
-        limit = st.number_input("Number of Records", min_value=10, max_value=1000, value=50, step=10)
+        # Limit filter, grown by the "Load more" button
+        st.session_state.setdefault('history_limit', HISTORY_PAGE_SIZE)
+        limit = st.number_input("Number of Records", min_value=10, max_value=HISTORY_MAX_LIMIT, step=10, key='history_limit')
     
-    # Get history data
+    # Get history data, always the most recent records so "Load more" only appends rows
     template_filter = None if selected_template == 'All' else selected_template
     history_records = history_db.get_history(limit=limit, template_name=template_filter)
     
@@ -102,54 +131,72 @@ def render_detailed_history():
     
     st.markdown(f"**Showing {len(history_records)} most recent records**")
     
-    # Display history records
-    for i, record in enumerate(history_records):
-        with st.expander(
-            f"🔄 {record['template_name']} - {record['record_count']} records - {record['generation_datetime'][:19]}",
-            expanded=False
-        ):
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                st.metric("Records Generated", record['record_count'])
-            
-            with col2:
-                generation_time = datetime.fromisoformat(record['generation_datetime'])
-                st.metric("Generation Time", generation_time.strftime('%Y-%m-%d %H:%M:%S'))
-            
-            with col3:
-                created_time = datetime.fromisoformat(record['created_at'])
-                st.metric("Saved to DB", created_time.strftime('%Y-%m-%d %H:%M:%S'))
-            
-            # Template content
-            st.markdown("**Template Content:**")
-            try:
-                template_content = json.loads(record['template_content'])
-                st.json(template_content)
-            except json.JSONDecodeError:
-                st.code(record['template_content'], language='json')
-            
-            # Action buttons
-            col1, col2, col3 = st.columns([2, 2, 6])
-            
-            with col1:
-                # Copy template to clipboard (as text)
-                template_text = json.dumps(json.loads(record['template_content']), indent=2)
-                st.code(f"Template copied!", language='text')
-                
-            with col2:
-                if st.button(f"🔄 Reuse Template", key=f"reuse_{record['id']}"):
-                    # Store the template in session state for reuse
-                    template_content = json.loads(record['template_content'])
-                    st.session_state[f"template_content_{record['template_name']}"] = json.dumps(template_content, indent=2)
-                    st.success(f"✅ Template loaded for {record['template_name']}!")
+    # One summary table instead of an expander per record; details render only for the selected row
+    summary_df = pd.DataFrame.from_records(
+        history_records, columns=['template_name', 'record_count', 'generation_datetime']
+    )
+    summary_df['generation_datetime'] = summary_df['generation_datetime'].str.slice(0, 19).str.replace('T', ' ')
+    summary_df = summary_df.rename(columns={
+        'template_name': 'Template Name',
+        'record_count': 'Records',
+        'generation_datetime': 'Generated'
+    })
+    
+    selection = st.dataframe(
+        summary_df,
+        use_container_width=True,
+        hide_index=True,
+        on_select="rerun",
+        selection_mode="single-row",
+        # A new filter or limit starts a fresh selection instead of keeping a stale row position
+        key=f"history_selection_{selected_template}_{limit}"
+    )
+    
+    st.button("⬇️ Load more", on_click=_load_more_history,
+              disabled=len(history_records) < limit or limit >= HISTORY_MAX_LIMIT)
+    
+    selected_rows = [row for row in selection.selection.rows if row < len(history_records)]
+    if not selected_rows:
+        st.caption("Select a record above to view its template and actions.")
+        return
+    
+    record = history_records[selected_rows[0]]
+    with st.expander(
+        f"🔄 {record['template_name']} - {record['record_count']} records - {record['generation_datetime'][:19]}",
+        expanded=True
+    ):
+        # Both timestamps are stored as ISO strings, trimming them is enough for display
+        st.markdown(
+            f"**Records:** {record['record_count']} &nbsp; "
+            f"**Generated:** {record['generation_datetime'][:19].replace('T', ' ')} &nbsp; "
+            f"**Saved:** {record['created_at'][:19].replace('T', ' ')}"
+        )
+        
+        # Template content, parsed once for both display and reuse
+        st.markdown("**Template Content:**")
+        try:
+            template_content = _parsed_template(record['id'], record['template_content'])
+            st.json(template_content)
+        except orjson.JSONDecodeError:
+            template_content = None
+            st.code(record['template_content'], language='json')
+        
+        # Action buttons
+        if st.button(f"🔄 Reuse Template", key=f"reuse_{record['id']}"):
+            # Store the template in session state for reuse
+            if template_content is None:
+                template_text = record['template_content']
+            else:
+                template_text = orjson.dumps(template_content, option=orjson.OPT_INDENT_2).decode()
+            set_template_content(record['template_name'], template_text)
+            st.success(f"✅ Template loaded for {record['template_name']}!")
 
 
 def render_history_management():
     """Render history management tools"""
     st.header("🔧 History Management")
     
-    history_db = get_history_db()
+    history_db = _db()
     
     st.subheader("🗑️ Cleanup Old Records")
     st.markdown("Remove old history records to keep the database clean.")
@@ -163,6 +210,7 @@ def render_history_management():
         if st.button("🗑️ Delete Old Records", type="secondary"):
             try:
                 deleted_count = history_db.delete_old_records(days_old)
+                _cached_usage_stats.clear()
                 if deleted_count > 0:
                     st.success(f"✅ Deleted {deleted_count} old records")
                 else:
@@ -177,15 +225,19 @@ def render_history_management():
     
     if st.button("📥 Export All History", type="secondary"):
         try:
-            all_history = history_db.get_history(limit=10000)  # Large limit to get all
-            if all_history:
-                # Convert to DataFrame for CSV export
-                df = pd.DataFrame(all_history)
-                csv = df.to_csv(index=False)
-                
+            # Stream records in chunks straight into the CSV buffer, no intermediate DataFrame
+            buffer = io.StringIO()
+            writer = None
+            for record in history_db.iter_history(chunk_size=1000):
+                if writer is None:
+                    writer = csv.DictWriter(buffer, fieldnames=list(record.keys()))
+                    writer.writeheader()
+                writer.writerow(record)
+            
+            if writer is not None:
                 st.download_button(
                     label="📥 Download history.csv",
-                    data=csv,
+                    data=buffer.getvalue(),
                     file_name=f"generation_history_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
                     mime="text/csv"
                 )
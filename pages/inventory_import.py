@@ -6,17 +6,49 @@ Provides UI for importing data including active inventory transfer functionality
 import streamlit as st
 import json
 import os
+import re
 from datetime import datetime
+from typing import Final
 from components.sidebar import render_sidebar
 import uuid
-from pandas import read_json
+import orjson
 from dotenv import load_dotenv
 
 load_dotenv()
 
-# Production imports (commented out for testing)
+# Production subdomains end in 'p' (e.g. https://clntp.sce.manh.com)
+_PROD_RE = re.compile(r'https://[\w-]*p(?=\.)')
 
-from scripts.inventory_transfer_sync import run_transfer_sync
+# Static sidebar help text, built once at import instead of on every rerun
+_HELP_ENV_MD: Final[str] = """
+**Environment Format**: Use short names like:
+- `dev01`, `test02`, `stage01`
+- Do not include full URLs
+
+**Tokens**: Use valid API tokens for each environment
+"""
+
+_HELP_NOTES_MD: Final[str] = """
+- Cannot transfer TO production environments
+- Large transfers may take significant time
+- Monitor the log for progress and errors
+- Failed records are saved to 'Failed/' directory
+"""
+
+_HELP_BATCH_MD: Final[str] = """
+**Download Batch Size**: 
+- Recommended: 100-500
+- Higher = faster but more memory usage
+
+**Upload Batch Size**: 
+- Recommended: 25-100  
+- Lower = more reliable for large datasets
+- During inventory transfers, smaller batches may succeed if locations are missing
+"""
+
+# The transfer script pulls in pandas, so it is imported only when a transfer is submitted
+
+from scripts.transfer_log import LOG_DIR, log_exists, read_log_lines
 testing = os.getenv('TESTING', 'False').lower()
 if testing == 'true':
     from_token_test = os.getenv('from_token_test')
@@ -69,9 +101,17 @@ if 'form_inventory_type' not in st.session_state:
 def get_log_file():
     uuid_val = st.session_state.get('transfer_log_uuid')
     if uuid_val:
-        return f"transfer_status_{uuid_val}.json"
+        return os.path.join(LOG_DIR, f"transfer_status_{uuid_val}.json")
     return None
 
+def read_log_rows(log_file, preferred_columns):
+    """Read the JSON lines transfer log, keeping only the preferred columns that are present"""
+    entries = [orjson.loads(line) for line in read_log_lines(log_file)]
+    display_columns = [col for col in preferred_columns if any(col in entry for entry in entries)]
+    if not display_columns:
+        return entries
+    return [{col: entry.get(col) for col in display_columns} for entry in entries]
+
 LOG_FILE = "transfer_status.json"
 st.set_page_config(page_title="RAD: Active Inventory Import", layout="wide", page_icon="🚀")
 st.title("📦 Active Inventory Import")
@@ -219,24 +259,20 @@ with st.form("inventory_config", enter_to_submit=False):
 
 
     # Submit button
-    prod_env = False
     # Validate prod env for 'p' at end of subdomain
-    import re
-    prod_pattern = r'https://[\w-]*p(?=\.)'
-    if to_env:
-        if re.search(prod_pattern, from_env) or re.search(prod_pattern, to_env):
-            prod_env = True
-            st.error("❌ Cannot use a production environment (subdomain ending in 'p') for source or target!")
+    prod_env = bool(to_env) and bool(_PROD_RE.search(from_env) or _PROD_RE.search(to_env))
+    if prod_env:
+        st.error("❌ Cannot use a production environment (subdomain ending in 'p') for source or target!")
     
     # Check for conflicting options
     conflicting_options = skip_items and skip_inventory
     if conflicting_options:
         st.error("❌ Cannot select both 'Skip Items' and 'Skip Inventory' options!")
         
-    can_submit = not prod_env and not conflicting_options and (all([
+    can_submit = not prod_env and not conflicting_options and (testing or all((
         from_env, from_org, from_facility, from_token,
         to_env, to_org, to_facility, to_token, attribute_value
-    ]) or testing)
+    )))
     if st.form_submit_button("🚀 Start Transfer", type="primary", use_container_width=True, disabled=not can_submit):
         # Store form values in session state
         st.session_state.submitted = True
@@ -244,21 +280,23 @@ with st.form("inventory_config", enter_to_submit=False):
 # Handle form submission
 if st.session_state.get('submitted', False):
     # Validate required fields
-    required_fields = {
-        'From Environment': from_env,
-        'From Organization': from_org,
-        'From Facility': from_facility,
-        'From Token': from_token,
-        'To Environment': to_env,
-        'To Organization': to_org,
-        'To Facility': to_facility,
-        'To Token': to_token,
-        f'{attribute_type.title()}': attribute_value}
-    missing_fields = [name for name, value in required_fields.items() if not value]
+    required_fields = (
+        ('From Environment', from_env),
+        ('From Organization', from_org),
+        ('From Facility', from_facility),
+        ('From Token', from_token),
+        ('To Environment', to_env),
+        ('To Organization', to_org),
+        ('To Facility', to_facility),
+        ('To Token', to_token),
+        (attribute_type.title(), attribute_value))
     
-    if len(missing_fields) > 0:
+    if any(not value for _, value in required_fields):
+        missing_fields = [name for name, value in required_fields if not value]
         st.error(f"❌ Please fill in all required fields: {', '.join(missing_fields)}")
     else:
+        from scripts.inventory_transfer_sync import run_transfer_sync
+        
         # Clear any previous transfer messages
         for msg in st.session_state.get('previous_transfer_messages', []):
             msg.empty()
@@ -273,7 +311,7 @@ if st.session_state.get('submitted', False):
         # Generate a new UUID for this transfer and store in session_state
         transfer_uuid = str(uuid.uuid4())
         st.session_state['transfer_log_uuid'] = transfer_uuid
-        log_file = f"transfer_status_{transfer_uuid}.json"
+        log_file = os.path.join(LOG_DIR, f"transfer_status_{transfer_uuid}.json")
         config = {
             'from_env': st.session_state.form_from_env,
             'from_org': st.session_state.form_from_org,
@@ -305,40 +343,29 @@ if st.session_state.get('submitted', False):
         
         def update_log_display(is_final=False):
             """Update the log display in real-time"""
-            if log_file and os.path.exists(log_file):
+            if log_file and log_exists(log_file):
                 try:
-                    with open(log_file, 'r') as f:
-                        log_df = read_json(log_file, lines=True)
+                    # Filter columns for clarity if they exist
+                    df = read_log_rows(log_file, ['status', 'response_status', 'env', 'trace', 'timestamp', 'message'])
                     
-                    if not log_df.empty:
-                        # Filter columns for clarity if they exist
-                        available_columns = log_df.columns.tolist()
-                        preferred_columns = ['status', 'response_status', 'env', 'trace', 'timestamp', 'message']
-                        display_columns = [col for col in preferred_columns if col in available_columns]
-                        
-                        if display_columns:
-                            df = log_df[display_columns]
-                        else:
-                            df = log_df
-                        
+                    if df:
                         with log_placeholder.container():
                             if is_final:
                                 st.subheader("📋 Transfer Log")
-                                st.dataframe(df, use_container_width=True)  # Show all entries when final
+                                st.dataframe(df, use_container_width=True, height=400)  # Show all entries when final
                                 # Add download button for final log
                                 try:
-                                    with open(log_file, "rb") as f:
-                                        st.download_button(
-                                            label="⬇️ Download Log File",
-                                            data=f,
-                                            file_name=os.path.basename(log_file),
-                                            mime="application/json"
-                                        )
+                                    st.download_button(
+                                        label="⬇️ Download Log File",
+                                        data=b"\n".join(read_log_lines(log_file)),
+                                        file_name=os.path.basename(log_file),
+                                        mime="application/json"
+                                    )
                                 except Exception as e:
                                     st.warning(f"Could not prepare log file for download: {str(e)}")
                             else:
                                 st.subheader("📋 Live Transfer Log")
-                                st.dataframe(df, use_container_width=True)  # Show last 10 entries during execution
+                                st.dataframe(df, use_container_width=True, height=400)  # Fixed height keeps the live grid virtualized
                 except Exception as e:
                     with log_placeholder.container():
                         st.warning(f"Could not read log file: {str(e)}")
@@ -391,33 +418,13 @@ with st.sidebar:
     st.markdown("### 💡 Help & Tips")
     
     with st.expander("🔧 Environment Setup"):
-        st.markdown("""
-        **Environment Format**: Use short names like:
-        - `dev01`, `test02`, `stage01`
-        - Do not include full URLs
-        
-        **Tokens**: Use valid API tokens for each environment
-        """)
+        st.markdown(_HELP_ENV_MD)
     
     with st.expander("⚠️ Important Notes"):
-        st.markdown("""
-        - Cannot transfer TO production environments
-        - Large transfers may take significant time
-        - Monitor the log for progress and errors
-        - Failed records are saved to 'Failed/' directory
-        """)
+        st.markdown(_HELP_NOTES_MD)
     
     with st.expander("📊 Batch Size Guidelines"):
-        st.markdown("""
-        **Download Batch Size**: 
-        - Recommended: 100-500
-        - Higher = faster but more memory usage
-        
-        **Upload Batch Size**: 
-        - Recommended: 25-100  
-        - Lower = more reliable for large datasets
-        - During inventory transfers, smaller batches may succeed if locations are missing
-        """)
+        st.markdown(_HELP_BATCH_MD)
 
 # Transfer log display for synchronous execution (only show if not currently running a transfer)
 
@@ -427,7 +434,7 @@ log_file = get_log_file()
 # and if we don't have a recent transfer that just completed
 if not st.session_state.get('submitted', False) and not st.session_state.get('transfer_running', False):
     # Show log if it exists
-    if log_file and os.path.exists(log_file):
+    if log_file and log_exists(log_file):
         st.subheader("📋 Transfer Log")
         
         # Refresh button for log display
@@ -436,21 +443,11 @@ if not st.session_state.get('submitted', False) and not st.session_state.get('tr
         
         # Display log content
         try:
-            with open(log_file, 'r') as f:
-                log_df = read_json(log_file, lines=True)
+            # Filter columns for clarity if they exist
+            df = read_log_rows(log_file, ['timestamp', 'status', 'message', 'response_status'])
             
-            if not log_df.empty:
-                # Filter columns for clarity if they exist
-                available_columns = log_df.columns.tolist()
-                preferred_columns = ['timestamp', 'status', 'message', 'response_status']
-                display_columns = [col for col in preferred_columns if col in available_columns]
-                
-                if display_columns:
-                    df = log_df[display_columns]
-                else:
-                    df = log_df
-                
-                st.dataframe(df, use_container_width=True)
+            if df:
+                st.dataframe(df, use_container_width=True, height=400)
             else:
                 st.info("Log file is empty or still being written to...")
         except Exception as e:
@@ -458,13 +455,12 @@ if not st.session_state.get('submitted', False) and not st.session_state.get('tr
         
         # Download button for log file
         try:
-            with open(log_file, "rb") as f:
-                st.download_button(
-                    label="⬇️ Download Log File",
-                    data=f,
-                    file_name=os.path.basename(log_file),
-                    mime="application/json"
-                )
+            st.download_button(
+                label="⬇️ Download Log File",
+                data=b"\n".join(read_log_lines(log_file)),
+                file_name=os.path.basename(log_file),
+                mime="application/json"
+            )
         except Exception as e:
             st.warning(f"Could not prepare log file for download: {str(e)}")
 
@@ -6,17 +6,26 @@ Provides UI for importing order data including active inventory transfer functio
 import streamlit as st
 import json
 import os
+import re
 from datetime import datetime
 from components.sidebar import render_sidebar
 import uuid
-from pandas import read_json
+import threading
+from collections import deque
+import orjson
 from dotenv import load_dotenv
 
 load_dotenv()
 
-# Production imports (commented out for testing)
+# Seconds between live log polls while a transfer is running in the background
+LOG_RENDER_INTERVAL = 1.0
 
-from scripts.order_transfer_sync import run_transfer_sync
+# Production subdomains end in 'p' (e.g. https://clntp.sce.manh.com)
+_PROD_RE = re.compile(r'https://[\w-]*p(?=\.)')
+
+# pandas and the transfer script are imported where they are used so viewing the page stays light
+
+from scripts.transfer_log import LOG_DIR, log_exists, log_mtime, read_log_lines, tail_log_lines
 
 testing = os.getenv('TESTING', 'False').lower()
 if testing == 'true':
@@ -36,41 +45,30 @@ if 'transfer_log_uuid' not in st.session_state:
     st.session_state['transfer_log_uuid'] = None
 
 # Initialize session state for form values
-if 'form_from_env' not in st.session_state:
-    st.session_state.form_from_env = from_env_test if testing else ""
-if 'form_from_org' not in st.session_state:
-    st.session_state.form_from_org = from_org_test if testing else ""
-if 'form_from_facility' not in st.session_state:
-    st.session_state.form_from_facility = from_facility_test if testing else ""
-if 'form_from_token' not in st.session_state:
-    st.session_state.form_from_token = from_token_test if testing else ""
-if 'form_to_env' not in st.session_state:
-    st.session_state.form_to_env = to_env_test if testing else ""
-if 'form_to_org' not in st.session_state:
-    st.session_state.form_to_org = to_org_test if testing else ""
-if 'form_to_facility' not in st.session_state:
-    st.session_state.form_to_facility = to_facility_test if testing else ""
-if 'form_to_token' not in st.session_state:
-    st.session_state.form_to_token = to_token_test if testing else ""
-if 'form_attribute_type' not in st.session_state:
-    st.session_state.form_attribute_type = "MinimumStatus"  # Default to MinimumStatus
-if 'form_attribute_value' not in st.session_state:
-    st.session_state.form_attribute_value = ""
-if 'form_download_batch_size' not in st.session_state:
-    st.session_state.form_download_batch_size = 200
-if 'form_upload_batch_size' not in st.session_state:
-    st.session_state.form_upload_batch_size = 50
-if 'form_skip_items' not in st.session_state:
-    st.session_state.form_skip_items = False
-if 'form_skip_orders' not in st.session_state:
-    st.session_state.form_skip_orders = False
-if 'form_skip_facilities' not in st.session_state:
-    st.session_state.form_skip_facilities = False
+_FORM_DEFAULTS = {
+    'form_from_env': from_env_test if testing else "",
+    'form_from_org': from_org_test if testing else "",
+    'form_from_facility': from_facility_test if testing else "",
+    'form_from_token': from_token_test if testing else "",
+    'form_to_env': to_env_test if testing else "",
+    'form_to_org': to_org_test if testing else "",
+    'form_to_facility': to_facility_test if testing else "",
+    'form_to_token': to_token_test if testing else "",
+    'form_attribute_type': "MinimumStatus",  # Default to MinimumStatus
+    'form_attribute_value': "",
+    'form_download_batch_size': 200,
+    'form_upload_batch_size': 50,
+    'form_skip_items': False,
+    'form_skip_orders': False,
+    'form_skip_facilities': False,
+}
+for key, value in _FORM_DEFAULTS.items():
+    st.session_state.setdefault(key, value)
 
 def get_log_file():
     uuid_val = st.session_state.get('transfer_log_uuid')
     if uuid_val:
-        return f"transfer_status_{uuid_val}.json"
+        return os.path.join(LOG_DIR, f"transfer_status_{uuid_val}.json")
     return None
 
 st.set_page_config(page_title="RAD: Order Import", layout="wide", page_icon="🚀")
@@ -102,8 +100,6 @@ if 'transfer_running' not in st.session_state:
     st.session_state.transfer_running = False
 if 'transfer_thread' not in st.session_state:
     st.session_state.transfer_thread = None
-if 'previous_transfer_messages' not in st.session_state:
-    st.session_state.previous_transfer_messages = []
     # Configuration form    
 with st.form("inventory_config", enter_to_submit=False):
     st.subheader("📋 Configuration")
@@ -222,10 +218,8 @@ with st.form("inventory_config", enter_to_submit=False):
     # Submit button
     prod_env = False
     # Validate prod env for 'p' at end of subdomain
-    import re
-    prod_pattern = r'https://[\w-]*p(?=\.)'
     if to_env:
-        if re.search(prod_pattern, from_env) or re.search(prod_pattern, to_env):
+        if _PROD_RE.search(from_env) or _PROD_RE.search(to_env):
             prod_env = True
             st.error("❌ Cannot use a production environment (subdomain ending in 'p') for source or target!")
     
@@ -242,6 +236,45 @@ with st.form("inventory_config", enter_to_submit=False):
         # Store form values in session state
         st.session_state.submitted = True
 
+@st.fragment(run_every=LOG_RENDER_INTERVAL)
+def render_transfer_progress():
+    """Poll the background transfer's log on a timer and rerun the page once the transfer ends"""
+    from pandas import DataFrame
+    
+    log_file = get_log_file()
+    transfer_thread = st.session_state.transfer_thread
+    finished = transfer_thread is None or not transfer_thread.is_alive()
+    
+    # Only parse lines written since the last poll, and skip the read when the file is unchanged
+    if log_file and log_exists(log_file):
+        mtime = log_mtime(log_file)
+        if mtime is None or mtime != st.session_state['log_mtime']:
+            st.session_state['log_mtime'] = mtime
+            try:
+                lines, st.session_state['log_offset'], restarted = tail_log_lines(
+                    log_file, st.session_state['log_offset'])
+                if restarted:
+                    st.session_state['log_rows'] = []
+                st.session_state['log_rows'].extend(orjson.loads(line) for line in lines)
+            except Exception as e:
+                st.warning(f"Could not read log file: {str(e)}")
+    
+    progress_messages = st.session_state['progress_messages']
+    with st.status(progress_messages[-1] if progress_messages else "Starting transfer...", expanded=True):
+        st.text('\n'.join(progress_messages))
+        if st.session_state['log_rows']:
+            st.subheader("📋 Live Transfer Log")
+            # Only the last 200 entries are converted and shown during execution
+            log_df = DataFrame.from_records(st.session_state['log_rows'][-200:])
+            preferred_columns = ['status', 'response_status', 'env', 'trace', 'timestamp', 'message']
+            display_columns = [col for col in preferred_columns if col in log_df.columns]
+            st.dataframe(log_df[display_columns] if display_columns else log_df, use_container_width=True)
+    
+    if finished:
+        st.session_state.transfer_running = False
+        st.session_state.is_running = False
+        st.rerun()
+
 # Handle form submission
 if st.session_state.get('submitted', False):
     # Validate required fields
@@ -260,21 +293,17 @@ if st.session_state.get('submitted', False):
     if len(missing_fields) > 0:
         st.error(f"❌ Please fill in all required fields: {', '.join(missing_fields)}")
     else:
-        # Clear any previous transfer messages
-        for msg in st.session_state.get('previous_transfer_messages', []):
-            msg.empty()
-        st.session_state.previous_transfer_messages = []
+        from scripts.order_transfer_sync import run_transfer_sync
         
+        # The transfer runs in the background, later reruns must not start it again
+        st.session_state.submitted = False
         st.session_state.transfer_running = True
         st.session_state.is_running = True
         
-        # Show transfer starting info message
-        transfer_info = st.info("🚀 Starting transfer... This may take some time. Please do not close this window.")
-        
         # Generate a new UUID for this transfer and store in session_state
         transfer_uuid = str(uuid.uuid4())
         st.session_state['transfer_log_uuid'] = transfer_uuid
-        log_file = f"transfer_status_{transfer_uuid}.json"
+        log_file = os.path.join(LOG_DIR, f"transfer_status_{transfer_uuid}.json")
         config = {
             'from_env': st.session_state.form_from_env,
             'from_org': st.session_state.form_from_org,
@@ -293,97 +322,39 @@ if st.session_state.get('submitted', False):
             'skip_facilities': st.session_state.form_skip_facilities,
         }
         
+        # Parsed log rows and read position, so each poll only parses newly written lines
+        st.session_state['log_offset'] = None
+        st.session_state['log_rows'] = []
+        st.session_state['log_mtime'] = None
         
-        progress_container = st.container()
-        with progress_container:
-            progress_bar = st.progress(0)
-            status_text = st.empty()
-
-        # Create log display container
-        log_container = st.container()
-        log_placeholder = st.empty()
-        
-        def update_log_display(is_final=False):
-            """Update the log display in real-time"""
-            if log_file and os.path.exists(log_file):
-                try:
-                    with open(log_file, 'r') as f:
-                        log_df = read_json(log_file, lines=True)
-                    
-                    if not log_df.empty:
-                        # Filter columns for clarity if they exist
-                        available_columns = log_df.columns.tolist()
-                        preferred_columns = ['status', 'response_status', 'env', 'trace', 'timestamp', 'message']
-                        display_columns = [col for col in preferred_columns if col in available_columns]
-                        
-                        if display_columns:
-                            df = log_df[display_columns]
-                        else:
-                            df = log_df
-                        
-                        with log_placeholder.container():
-                            if is_final:
-                                st.subheader("📋 Transfer Log")
-                                st.dataframe(df, use_container_width=True)  # Show all entries when final
-                                # Add download button for final log
-                                try:
-                                    with open(log_file, "rb") as f:
-                                        st.download_button(
-                                            label="⬇️ Download Log File",
-                                            data=f,
-                                            file_name=os.path.basename(log_file),
-                                            mime="application/json"
-                                        )
-                                except Exception as e:
-                                    st.warning(f"Could not prepare log file for download: {str(e)}")
-                            else:
-                                st.subheader("📋 Live Transfer Log")
-                                st.dataframe(df, use_container_width=True)  # Show last 10 entries during execution
-                except Exception as e:
-                    with log_placeholder.container():
-                        st.warning(f"Could not read log file: {str(e)}")
+        # The worker thread must not touch st.session_state, it only appends progress
+        # messages and records its outcome in these shared objects
+        progress_messages = deque(maxlen=5)
+        transfer_result = {'success': None, 'error': None}
         
-        def progress_callback(message):
-            """Callback to update progress in Streamlit"""
-            status_text.text(message)
-            # Update log display when progress changes
-            update_log_display()
-            # Note: progress_bar updates would need more sophisticated progress tracking
-            # Run transfer directly
+        def run_transfer():
+            try:
+                transfer_result['success'] = run_transfer_sync(config, log_file, progress_messages.append)
+            except Exception as e:
+                transfer_result['error'] = str(e)
+                transfer_result['success'] = False
         
-        try:
-            # Show initial log display
-            update_log_display()
-            success = run_transfer_sync(config, log_file, progress_callback)
-            if success:
-                # Hide the transfer info message
-                transfer_info.empty()
-                success_msg = st.success("✅ Transfer completed successfully!")
-                st.session_state.previous_transfer_messages.append(success_msg)
-                progress_bar.progress(100)
-                status_text.text("Transfer completed!")
-                # Final log update - show complete log with download button
-                update_log_display(is_final=True)
-            else:
-                # Hide the transfer info message
-                transfer_info.empty()
-                error_msg = st.error("❌ Transfer failed. Check logs for details.")
-                st.session_state.previous_transfer_messages.append(error_msg)
-                status_text.text("Transfer failed!")
-                # Final log update - show complete log with download button
-                update_log_display(is_final=True)
-        except Exception as e:
-            # Hide the transfer info message
-            transfer_info.empty()
-            error_msg = st.error(f"❌ Transfer error: {str(e)}")
-            st.session_state.previous_transfer_messages.append(error_msg)
-            status_text.text(f"Error: {str(e)}")
-            # Final log update on error - show complete log with download button
-            update_log_display(is_final=True)
-        finally:
-            st.session_state.transfer_running = False
-            st.session_state.is_running = False
-    # st.rerun()
+        st.session_state['progress_messages'] = progress_messages
+        st.session_state['transfer_result'] = transfer_result
+        st.session_state.transfer_thread = threading.Thread(target=run_transfer, daemon=True)
+        st.session_state.transfer_thread.start()
+
+if st.session_state.transfer_running:
+    st.info("🚀 Transfer in progress... This may take some time.")
+    render_transfer_progress()
+elif st.session_state.get('transfer_result') and st.session_state['transfer_result']['success'] is not None:
+    transfer_result = st.session_state['transfer_result']
+    if transfer_result['success']:
+        st.success("✅ Transfer completed successfully!")
+    elif transfer_result['error']:
+        st.error(f"❌ Transfer error: {transfer_result['error']}")
+    else:
+        st.error("❌ Transfer failed. Check logs for details.")
 
 
 # Add helpful information in sidebar
@@ -427,7 +398,7 @@ log_file = get_log_file()
 # and if we don't have a recent transfer that just completed
 if not st.session_state.get('submitted', False) and not st.session_state.get('transfer_running', False):
     # Show log if it exists
-    if log_file and os.path.exists(log_file):
+    if log_file and log_exists(log_file):
         st.subheader("📋 Transfer Log")
         
         # Refresh button for log display
@@ -436,8 +407,9 @@ if not st.session_state.get('submitted', False) and not st.session_state.get('tr
         
         # Display log content
         try:
-            with open(log_file, 'r') as f:
-                log_df = read_json(log_file, lines=True)
+            from pandas import DataFrame
+            
+            log_df = DataFrame.from_records([orjson.loads(line) for line in read_log_lines(log_file)])
             
             if not log_df.empty:
                 # Filter columns for clarity if they exist
@@ -458,13 +430,12 @@ if not st.session_state.get('submitted', False) and not st.session_state.get('tr
         
         # Download button for log file
         try:
-            with open(log_file, "rb") as f:
-                st.download_button(
-                    label="⬇️ Download Log File",
-                    data=f,
-                    file_name=os.path.basename(log_file),
-                    mime="application/json"
-                )
+            st.download_button(
+                label="⬇️ Download Log File",
+                data=b"\n".join(read_log_lines(log_file)),
+                file_name=os.path.basename(log_file),
+                mime="application/json"
+            )
         except Exception as e:
             st.warning(f"Could not prepare log file for download: {str(e)}")
 
@@ -6,18 +6,32 @@ The query results are stored as dataframes and made accessible for use in genera
 
 import streamlit as st
 import pandas as pd
-import json
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import io
+import orjson
 import requests
 import os
-from typing import Dict, Any, Optional, List
+import sys
+from typing import Dict, Any, Optional, List, Tuple, Union
+from dataclasses import dataclass
 from datetime import datetime
 from streamlit_ace import st_ace
 import time 
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
 
 from components.sidebar import render_sidebar
 from components.wiretap import query_execution_wrapper
+from data_creation.query_context_utils import QueryEntry, build_column_index
 from config import load_initial_config_to_session
 
+# Column names shared by stored queries over the same schema point at one string
+_HEADER_CACHE: Dict[str, str] = {}
+
+# Re-runs of stored queries are mostly waiting on the server, so they run here concurrently
+_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="query_context")
+
 
 def load_dev_query_context() -> Dict[str, Any]:
     """
@@ -29,8 +43,8 @@ def load_dev_query_context() -> Dict[str, Any]:
     try:
         dev_query_file = "dev_query_context.json"
         if os.path.exists(dev_query_file):
-            with open(dev_query_file, 'r') as f:
-                return json.load(f)
+            with open(dev_query_file, 'rb') as f:
+                return orjson.loads(f.read())
         return {}
     except Exception as e:
         st.warning(f"Error loading dev_query_context.json: {str(e)}")
@@ -55,30 +69,103 @@ def get_query_by_name(query_name: str, dev_queries: List[Dict]) -> Optional[str]
      
     
 
-def store_query_result_as_dataframe(query_result: pd.DataFrame, query_name: str) -> bool:
+def _optimize_dtypes(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Store query result as a pandas DataFrame in session state for use in templates
+    Shrink column dtypes without changing any value
+    
+    Numeric columns are downcast to the smallest int/float that holds them and text columns
+    where most values repeat become categoricals, which Arrow stores dictionary-encoded.
+    Text is never parsed as numbers; wiretap returns every column as text and values such
+    as zero-padded ids must reach the templates unchanged.
+    
+    Args:
+        df: Query result to optimize
+        
+    Returns:
+        DataFrame with optimized dtypes
+    """
+    for column in df.columns:
+        values = df[column]
+        if pd.api.types.is_integer_dtype(values):
+            df[column] = pd.to_numeric(values, downcast='integer')
+        elif pd.api.types.is_float_dtype(values):
+            df[column] = pd.to_numeric(values, downcast='float')
+        elif pd.api.types.is_string_dtype(values) and len(values) and values.nunique() / len(values) < 0.5:
+            df[column] = values.astype('category')
+    return df
+
+
+def _query_entry(table: pa.Table, created_at: datetime, key_columns: Optional[List[str]],
+                 sql_query: Optional[str], organization: Optional[str]) -> QueryEntry:
+    """Build the session state entry of a stored query result"""
+    # Column-major by construction; combine_chunks keeps every column in one contiguous buffer
+    table = table.combine_chunks()
+    columns = tuple(table.column_names) if table.num_rows else ()
+    return QueryEntry(
+        table=table,
+        # Zero-copy slice handed to st.dataframe as Arrow, the preview never goes through pandas
+        preview=table.slice(0, 10),
+        created_at=created_at,
+        row_count=table.num_rows,
+        col_count=len(columns),
+        columns=columns,
+        indexes={col: build_column_index(table.column(col).to_pylist()) for col in key_columns or []},
+        frames={},
+        sql=sql_query,
+        organization=organization
+    )
+
+
+def _put_query(query_name: str, entry: QueryEntry):
+    """
+    Store a query entry in session state
+    
+    The light metadata is also kept under query_meta so pages that only list queries
+    never reference the stored tables.
+    """
+    query_name = sys.intern(query_name)
+    st.session_state.setdefault('query_dataframes', {})[query_name] = entry
+    st.session_state.setdefault('query_meta', {})[query_name] = {
+        'row_count': entry.row_count,
+        'columns': entry.columns,
+        'created_at': entry.created_at
+    }
+
+
+def _drop_query(query_name: str):
+    """Remove a stored query result from session state"""
+    st.session_state.get('query_dataframes', {}).pop(query_name, None)
+    st.session_state.get('query_meta', {}).pop(query_name, None)
+
+
+def store_query_result_as_dataframe(query_result: pd.DataFrame, query_name: str,
+                                    key_columns: Optional[List[str]] = None,
+                                    sql_query: Optional[str] = None,
+                                    organization: Optional[str] = None) -> bool:
+    """
+    Store query result as an Arrow table in session state for use in templates
+    
+    Arrow keeps string columns in contiguous buffers instead of one Python object per cell;
+    get_query_dataframe materializes a pandas view over it when templates need one.
     
     Args:
         query_result: Result from execute_sql_query
-        query_name: Name to store the DataFrame under
+        query_name: Name to store the result under
+        key_columns: Columns to index up front for match mode lookups (others are indexed on first use)
+        sql_query: SQL that produced the result, kept so the query can be re-run
+        organization: Organization the query was executed for
         
     Returns:
         True if successful, False otherwise
     """
     try:
-        df = query_result
+        df = _optimize_dtypes(query_result)
+        df.columns = pd.Index([_HEADER_CACHE.setdefault(col, sys.intern(col)) for col in df.columns])
 
         # Store in session state under a specific key structure
-        if 'query_dataframes' not in st.session_state:
-            st.session_state['query_dataframes'] = {}
         print(f"Storing query result '{query_name}' with {len(df)} rows")
-        st.session_state['query_dataframes'][query_name] = {
-            'dataframe': df,
-            'created_at': datetime.now(),
-            'row_count': len(df),
-            'columns': list(df.columns) if not df.empty else []
-        }
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        _put_query(query_name, _query_entry(table, datetime.now(), key_columns, sql_query, organization))
         
         return True
         
@@ -156,36 +243,128 @@ def render_query_interface():
     
     with col2:
         if st.button("🗑️ Clear Results", help="Clear all stored query results"):
-            if 'query_dataframes' in st.session_state:
-                del st.session_state['query_dataframes']
+            for query_name in list(st.session_state.get('query_dataframes', {})):
+                _drop_query(query_name)
             st.success("✅ Query results cleared!")
 
 
+@st.cache_data(show_spinner=False, ttl=600, persist=None)
+def _cached_query(base_url: str, sql_query: str, organization: str, token: str) -> pd.DataFrame:
+    """
+    Execute a query, reusing the result of an identical recent execution
+    
+    The token is part of the cache key so users never share each other's results.
+    """
+    headers = {
+        "Content-Type": "application/json",
+        "Authorization": token,
+        "Organization": organization
+    }
+    return query_execution_wrapper(base_url, headers, sql_query)
+
+
+@dataclass(slots=True)
+class QueryOk:
+    """Successful query execution"""
+    df: pd.DataFrame
+
+
+@dataclass(slots=True)
+class QueryErr:
+    """Failed query execution with the error details shown to the user"""
+    payload: Dict[str, Any]
+
+
+QueryResult = Union[QueryOk, QueryErr]
+
+
+def _run_query(query_fn, *args) -> QueryResult:
+    """
+    Run a query function, turning its outcome into a QueryResult
+    
+    Failures are caught outside _cached_query so errors are never cached.
+    """
+    try:
+        return QueryOk(query_fn(*args))
+    except Exception as e:
+        return QueryErr({'error': str(e)})
+
+
 def execute_query_workflow(sql_query, base_url, headers, query_name):
     """Execute the complete query workflow"""
     try:
-        # Show progress
-        with st.spinner(f"Executing query '{query_name}'..."):
-            # Execute the query
-            result = query_execution_wrapper(base_url, headers, sql_query)
+        # The cached call stays on the script thread, st.cache_data needs its ScriptRunContext;
+        # repeat executions are served from the cache
+        with st.status(f"Executing query '{query_name}'...") as status:
+            result = _run_query(_cached_query, base_url, sql_query,
+                                headers['Organization'], headers['Authorization'])
+            status.update(label=f"Query '{query_name}' finished", state="complete")
 
-        if isinstance(result, pd.DataFrame):
+        if isinstance(result, QueryOk):
             # Store as DataFrame
-            if store_query_result_as_dataframe(result, query_name):
-                st.success(f"✅ Query '{query_name}' executed successfully! {len(result)} rows retrieved")
+            if store_query_result_as_dataframe(result.df, query_name, sql_query=sql_query,
+                                               organization=headers['Organization']):
+                st.success(f"✅ Query '{query_name}' executed successfully! {len(result.df)} rows retrieved")
             else:
                 st.error("❌ Failed to store query results")
         else:
-            st.error(f"❌ Query failed: {result}")
+            st.error(f"❌ Query failed: {result.payload['error']}")
             
             # Show additional error details in an expander
             with st.expander("Error Details"):
-                st.code(json.dumps(result, indent=2), language='json')
+                st.code(orjson.dumps(result.payload, option=orjson.OPT_INDENT_2).decode('utf-8'), language='json')
                 
     except Exception as e:
         st.error(f"❌ Unexpected error: {str(e)}")
 
 
+def execute_all_queries(query_names: List[str], base_url: str, token: str) -> Dict[str, str]:
+    """
+    Re-run stored queries concurrently, storing each result as soon as it arrives
+    
+    Re-runs bypass the query cache so the stored results are refreshed from the environment.
+    
+    Args:
+        query_names: Names of stored queries to re-run
+        base_url: Environment to run the queries against
+        token: Authorization token for the requests
+        
+    Returns:
+        Error message per query name that failed
+    """
+    query_dataframes = st.session_state.get('query_dataframes', {})
+    futures = {}
+    for query_name in query_names:
+        query_info = query_dataframes.get(query_name)
+        if query_info is None or not query_info.sql:
+            continue
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": token,
+            "Organization": query_info.organization
+        }
+        future = _EXECUTOR.submit(_run_query, query_execution_wrapper, base_url, headers, query_info.sql)
+        futures[future] = (query_name, query_info)
+    
+    errors = {}
+    for future in as_completed(futures):
+        query_name, query_info = futures[future]
+        result = future.result()
+        if isinstance(result, QueryErr):
+            errors[query_name] = result.payload['error']
+            continue
+        store_query_result_as_dataframe(result.df, query_name, key_columns=list(query_info.indexes),
+                                        sql_query=query_info.sql, organization=query_info.organization)
+    return errors
+
+
+def _table_to_csv_bytes(table: pa.Table) -> bytes:
+    """Serialize a stored query table to CSV with Arrow's writer, skipping the pandas string round trip"""
+    buffer = io.BytesIO()
+    pacsv.write_csv(table, buffer)
+    return buffer.getvalue()
+
+
 def render_stored_queries():
     """Render the section showing stored query results"""
     st.subheader("📊 Stored Query Results")
@@ -199,34 +378,44 @@ def render_stored_queries():
     # Show summary of stored queries
     st.markdown(f"**{len(query_dataframes)} query result(s) available for template generation:**")
     
-    for query_name, query_info in query_dataframes.items():
-        with st.expander(f"📋 {query_name} ({query_info['row_count']} rows)", expanded=False):
-            df = query_info['dataframe']
+    if st.button("🔄 Re-run All Queries", help="Refresh every stored query result from the environment"):
+        with st.spinner(f"Re-running {len(query_dataframes)} queries..."):
+            errors = execute_all_queries(list(query_dataframes), st.session_state.get('base_url', ''),
+                                         st.session_state.get('shared_token', ''))
+        for query_name, error in errors.items():
+            st.error(f"❌ Query '{query_name}' failed: {error}")
+        if not errors:
+            st.success("✅ All queries refreshed!")
+    
+    # Two-column grid so the expanders are laid out side by side
+    grid = st.columns(2)
+    for i, (query_name, query_info) in enumerate(query_dataframes.items()):
+        with grid[i % 2], st.expander(f"📋 {query_name} ({query_info.row_count} rows)", expanded=False):
+            table = query_info.table
             
             # Query metadata
             col1, col2, col3 = st.columns(3)
             with col1:
-                st.metric("Rows", query_info['row_count'])
+                st.metric("Rows", query_info.row_count)
             with col2:
-                st.metric("Columns", len(query_info['columns']))
+                st.metric("Columns", query_info.col_count)
             with col3:
-                st.caption(f"Created: {query_info['created_at'].strftime('%Y-%m-%d %H:%M:%S')}")
+                st.caption(f"Created: {query_info.created_at.strftime('%Y-%m-%d %H:%M:%S')}")
             
             # Show column information
-            if query_info['columns']:
+            if query_info.columns:
                 st.markdown("**Columns:**")
-                st.code(", ".join(query_info['columns']))
+                st.code(", ".join(query_info.columns))
             
             # Show data preview
-            if not df.empty:
+            if table.num_rows:
                 st.markdown("**Data Preview (first 10 rows):**")
-                st.dataframe(df.head(10), use_container_width=True)
+                st.dataframe(query_info.preview, use_container_width=True)
                 
-                # Download button for full dataset
-                csv = df.to_csv(index=False)
+                # Download button for full dataset, the CSV is only built when it is clicked
                 st.download_button(
                     label=f"📥 Download {query_name}.csv",
-                    data=csv,
+                    data=partial(_table_to_csv_bytes, table),
                     file_name=f"{query_name}.csv",
                     mime="text/csv"
                 )
@@ -235,16 +424,34 @@ def render_stored_queries():
             
             # Delete button
             if st.button(f"🗑️ Delete {query_name}", key=f"delete_{query_name}"):
-                del st.session_state['query_dataframes'][query_name]
+                _drop_query(query_name)
                 st.success(f"✅ Deleted query result '{query_name}'")
                 st.rerun()
 
 
+@st.cache_data(show_spinner=False)
+def _example_code(query_name: str, columns: Tuple[str, ...]) -> str:
+    """Example snippet reading a stored query result, built once per query name and columns"""
+    template_fields = "\n".join(f'    "{col}": random_row["{col}"].iloc[0],' for col in columns)
+    return f"""
+# Get the {query_name} query result
+{query_name}_df = get_query_dataframe('{query_name}')
+
+# Sample a random row
+random_row = {query_name}_df.sample(1)
+
+# Extract values for template
+template_data = {{
+{template_fields}
+}}
+                """
+
+
 def render_template_integration_guide():
     """Render guide on how to use query results in templates"""
     st.subheader("🔗 Using Query Results in Templates")
     
-    query_dataframes = st.session_state.get('query_dataframes', {})
+    query_meta = st.session_state.get('query_meta', {})
     dev_query_context = load_dev_query_context()
     dev_queries = dev_query_context.get("queries", [])
     
@@ -257,7 +464,7 @@ def render_template_integration_guide():
                 st.code(query['query'], language='sql')
                 st.markdown("---")
     
-    if not query_dataframes:
+    if not query_meta:
         st.info("Execute queries above to see integration examples.")
         return
     
@@ -267,11 +474,11 @@ def render_template_integration_guide():
     """)
     
     # Show available queries
-    query_names = list(query_dataframes.keys())
+    query_names = list(query_meta.keys())
     if query_names:
         st.markdown("**Available Query Results:**")
         for query_name in query_names:
-            info = query_dataframes[query_name]
+            info = query_meta[query_name]
             st.markdown(f"- `{query_name}` - {info['row_count']} rows with columns: {', '.join(info['columns'][:5])}{'...' if len(info['columns']) > 5 else ''}")
     
     # Show example usage
@@ -336,22 +543,11 @@ def render_template_integration_guide():
         if query_names:
             selected_query = st.selectbox("Select query for example:", query_names)
             if selected_query:
-                info = query_dataframes[selected_query]
+                info = query_meta[selected_query]
                 columns = info['columns'][:3]  # Show first 3 columns
                 
                 st.markdown(f"**Example usage for '{selected_query}':**")
-                st.code(f"""
-# Get the {selected_query} query result
-{selected_query}_df = get_query_dataframe('{selected_query}')
-
-# Sample a random row
-random_row = {selected_query}_df.sample(1)
-
-# Extract values for template
-template_data = {{
-{chr(10).join([f'    "{col}": random_row["{col}"].iloc[0],' for col in columns])}
-}}
-                """, language='python')
+                st.code(_example_code(selected_query, columns), language='python')
 
 
 def main():
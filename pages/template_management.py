@@ -4,40 +4,94 @@ Handles import/export and management of templates in session memory only
 No templates are stored on the server - everything is session-based
 """
 
-import json
-import os
+import orjson
+import pyarrow as pa
+import pyarrow.compute as pc
 import streamlit as st
+from streamlit_ace import st_ace
 from datetime import datetime
-from typing import Dict, Any, List, Optional, Tuple
-import glob
+from functools import partial
+from typing import Dict, Any, List, Tuple
 
 from components.sidebar import render_sidebar, mark_config_updated
 from templates.session_base_template_manager import SessionBaseTemplateManager
-from templates.bulk_template_manager import BulkTemplateManager
-from data_creation.template_generator import TemplateGenerator
+from data_creation.template_generator import (
+    TemplateGenerator, TEMPLATE_CONTENT_PREFIX, set_template_content, remove_template_content,
+    get_template_content_names, get_dirty_template_content_names
+)
 from data_creation.dev_config import is_dev_mode, get_dev_templates
 
 
-def _sync_generator_to_session_templates(template_generator):
+def _dumps(obj: Any, indent: bool = False) -> str:
+    """Serialize to a JSON string with orjson, indented by 2 spaces when requested"""
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+
+
+_loads = orjson.loads
+
+
+# Generation template sections that hold field definitions
+_GENERATION_FIELD_SECTIONS = ("StaticFields", "SequenceFields", "RandomFields", "LinkedFields")
+
+
+def _generation_field_count(template_name: str, template: Any) -> int:
     """
-    Sync templates from the template generator to session state
-    This ensures imported templates are available in the editor
+    Number of field definitions in a generation template
     
-    Args:
-        template_generator: TemplateGenerator instance with templates to sync
+    Counts are cached in session state against the template object, so a template that is
+    replaced by an import or edit is counted again on its next lookup.
     """
-    for template_name, template_content in template_generator.generation_templates.items():
-        # Create session state key for this template
-        content_key = f"template_content_{template_name}"
-        
-        # Convert template content to JSON string and store in session state
-        try:
-            template_json = json.dumps(template_content, indent=2)
-            st.session_state[content_key] = template_json
-        except Exception as e:
-            continue
+    field_counts = st.session_state.setdefault('generation_field_counts', {})
+    cached = field_counts.get(template_name)
+    if cached is not None and cached[0] is template:
+        return cached[1]
+    
+    field_count = 0
+    if isinstance(template, dict):
+        # An empty tuple default avoids allocating a dict for every missing section
+        field_count = sum(len(template.get(section, ())) for section in _GENERATION_FIELD_SECTIONS)
+    field_counts[template_name] = (template, field_count)
+    return field_count
+
+
+def _sorted_template_names(templates: Dict[str, Any], cache_key: str) -> List[str]:
+    """
+    Template names in sorted order, re-sorted only when the set of names changes
+    
+    The insertion-ordered key tuple is kept next to the sorted list; comparing it is a
+    linear check, so reruns without adds or deletes skip the sort.
+    """
+    names = tuple(templates)
+    cached = st.session_state.get(cache_key)
+    if cached is None or cached[0] != names:
+        cached = (names, sorted(names))
+        st.session_state[cache_key] = cached
+    return cached[1]
 
 
+def _pretty_template_json(template_name: str, template: Any) -> str:
+    """Indented JSON for the editor, cached in session state against the template object"""
+    pretty_cache = st.session_state.setdefault('pretty_template_json', {})
+    cached = pretty_cache.get(template_name)
+    if cached is None or cached[0] is not template:
+        cached = (template, _dumps(template, indent=True))
+        pretty_cache[template_name] = cached
+    return cached[1]
+
+
+def _store_generation_template_json(template_name: str, template: Any):
+    """
+    Put a generation template's indented JSON in session state for the editor
+    
+    The text is recorded with the object it came from, so the export sync
+    recognizes it and keeps that object instead of parsing the text back.
+    """
+    template_json = _dumps(template, indent=True)
+    set_template_content(template_name, template_json)
+    st.session_state.setdefault('synced_template_json', {})[template_name] = (template_json, template)
+    # Written from the object itself, so there is nothing to sync back
+    get_dirty_template_content_names().discard(template_name)
+
 
 def _sync_session_templates_to_generator(template_generator):
     """
@@ -47,33 +101,141 @@ def _sync_session_templates_to_generator(template_generator):
     Args:
         template_generator: TemplateGenerator instance to update
     """
-    # Find all template content keys in session state
-    template_content_keys = [k for k in st.session_state.keys() if k.startswith('template_content_')]
+    # {name: (synced text, parsed template)}, unchanged text keeps the already parsed object
+    synced = st.session_state.setdefault('synced_template_json', {})
+    dirty = get_dirty_template_content_names()
+    generation_templates = template_generator.generation_templates
     
-    for content_key in template_content_keys:
-        # Extract template name from the key
-        template_name = content_key.replace('template_content_', '')
+    # Template names come from the content index, not a scan of every session key
+    for template_name in get_template_content_names():
+        cached = synced.get(template_name)
+        in_sync = cached is not None and generation_templates.get(template_name) is cached[1]
+        # Text not rewritten since the last sync, and the generator still holds what it produced
+        if in_sync and template_name not in dirty:
+            continue
         
         try:
             # Get the template content from session state
-            template_json = st.session_state[content_key]
-            
-            # Parse and validate the JSON
-            template_content = json.loads(template_json)
+            template_json = st.session_state.get(f"{TEMPLATE_CONTENT_PREFIX}{template_name}")
+            if template_json is None:
+                # Key removed outside set_template_content, keep the index in step with session state
+                remove_template_content(template_name)
+                continue
             
-            # Update the template generator with the session state content
-            template_generator.generation_templates[template_name] = template_content
+            if not (in_sync and cached[0] == template_json):
+                # Parse and validate the JSON
+                template_content = _loads(template_json)
+                
+                # Update the template generator with the session state content
+                generation_templates[template_name] = template_content
+                synced[template_name] = (template_json, template_content)
+            dirty.discard(template_name)
             
-        except (json.JSONDecodeError, KeyError) as e:
+        except (orjson.JSONDecodeError, KeyError) as e:
             # Skip invalid templates but don't break the export
             st.error(f"Warning: Could not sync template {template_name}: {e}")
             continue
 
 
+def _build_combined_export(template_manager, template_generator) -> Tuple[Dict[str, Any], Any]:
+    """
+    Build the combined export of all base and generation templates
+    
+    Returns:
+        The export dictionary and its JSON bytes
+    """
+    base_templates = template_manager.base_templates
+    generation_templates = template_generator.generation_templates
+    
+    # Prepare combined export data
+    combined_export = {
+        "metadata": {
+            "export_date": datetime.now().isoformat(),
+            "export_tool": "RAD Template Management - Bulk Export",
+            "base_template_count": len(base_templates),
+            "generation_template_count": len(generation_templates),
+            "total_template_count": len(base_templates) + len(generation_templates)
+        },
+        "base_templates": [],
+        "generation_templates": []
+    }
+    
+    # Add base templates, sorted by name so the same template set always exports the same file
+    for template_name in _sorted_template_names(base_templates, 'base_template_names_sorted'):
+        combined_export["base_templates"].append({
+            "name": template_name,
+            "content": base_templates[template_name]
+        })
+    
+    # Add generation templates
+    for template_name in _sorted_template_names(generation_templates, 'generation_template_names_sorted'):
+        combined_export["generation_templates"].append({
+            "name": template_name,
+            "content": generation_templates[template_name]
+        })
+    
+    # Encoded during the script run, the caller keeps the bytes until a template changes;
+    # orjson's bytes go out as-is instead of being decoded to str and re-encoded by the download.
+    # The file is meant for re-import, so it is written compact rather than indented
+    return combined_export, _export_bytes(combined_export)
+
+
+def _export_bytes(combined_export: Dict[str, Any]) -> bytes:
+    """
+    Compact JSON of a combined export, assembled from per-template chunks
+    
+    Each template entry is encoded on its own and kept in session state against its content
+    object, so after an edit only the changed templates are encoded again.
+    """
+    entry_cache = st.session_state.setdefault('export_entry_bytes', {})
+    parts = [b'{"metadata":', orjson.dumps(combined_export["metadata"])]
+    live_keys = set()
+    for section in ("base_templates", "generation_templates"):
+        chunks = []
+        for entry in combined_export[section]:
+            key = (section, entry["name"])
+            cached = entry_cache.get(key)
+            if cached is None or cached[0] is not entry["content"]:
+                cached = (entry["content"], orjson.dumps(entry))
+                entry_cache[key] = cached
+            chunks.append(cached[1])
+            live_keys.add(key)
+        parts += [b',"', section.encode(), b'":[', b",".join(chunks), b"]"]
+    parts.append(b"}")
+    
+    # Drop chunks of templates that are no longer exported
+    for key in entry_cache.keys() - live_keys:
+        del entry_cache[key]
+    return b"".join(parts)
+
+
+def _export_preview_markdown(combined_export: Dict[str, Any]) -> Tuple[str, str]:
+    """Base and generation name lists of an export, one markdown block each"""
+    return (
+        "\n".join([
+            f"**Base Templates ({len(combined_export['base_templates'])}):**\n",
+            *(f"- {template['name']}" for template in combined_export["base_templates"])
+        ]),
+        "\n".join([
+            f"**Generation Templates ({len(combined_export['generation_templates'])}):**\n",
+            *(f"- {template['name']}" for template in combined_export["generation_templates"])
+        ])
+    )
+
+
 # Initialize the session-only template manager
 def get_session_template_manager():
     """Get session-only template manager instance - no server storage"""
-    return SessionBaseTemplateManager()
+    if 'template_manager_instance' not in st.session_state:
+        st.session_state['template_manager_instance'] = SessionBaseTemplateManager()
+    return st.session_state['template_manager_instance']
+
+
+def get_session_template_generator():
+    """Get the session's template generator, examples are loaded from disk once per session"""
+    if 'template_generator_instance' not in st.session_state:
+        st.session_state['template_generator_instance'] = TemplateGenerator()
+    return st.session_state['template_generator_instance']
 
 
 def load_dev_templates_if_dev_mode():
@@ -81,11 +243,13 @@ def load_dev_templates_if_dev_mode():
     Load templates from dev_gen_templates.json if in dev mode
     These will be merged with the session-based templates
     """
-    if not is_dev_mode():
+    # Only load once per session to avoid overriding user changes. Checked first and set
+    # before loading, so .env and the templates file are read once per session, not per rerun
+    if st.session_state.get('dev_templates_loaded_to_manager', False):
         return
+    st.session_state['dev_templates_loaded_to_manager'] = True
     
-    # Only load once per session to avoid overriding user changes
-    if st.session_state.get('dev_templates_loaded_to_manager', False):
+    if not is_dev_mode():
         return
     
     dev_templates = get_dev_templates()
@@ -103,18 +267,11 @@ def load_dev_templates_if_dev_mode():
             # Add template to generation templates
             st.session_state['session_generation_templates'][template_name] = template_content
             
-            # Create content key for editor
-            content_key = f"template_content_{template_name}"
-            
             # Convert template content to JSON string for editor
             try:
-                template_json = json.dumps(template_content, indent=2)
-                st.session_state[content_key] = template_json
+                _store_generation_template_json(template_name, template_content)
             except Exception as e:
                 continue
-            
-        # Mark as loaded to prevent re-loading
-        st.session_state['dev_templates_loaded_to_manager'] = True
         
         # Show a subtle notification
         if dev_templates:
@@ -133,7 +290,7 @@ st.title("🗂️ Template Management")
 
 # Get template manager instance
 template_manager = get_session_template_manager()
-template_generator = TemplateGenerator()
+template_generator = get_session_template_generator()
 
 # Load templates from dev config if in dev mode
 load_dev_templates_if_dev_mode()
@@ -153,10 +310,13 @@ These templates contain the default field values and structure for different API
 """)
 
 
-# Main functionality tabs
-tab1, tab2, tab3 = st.tabs(["📤 Bulk Export/Import", "📝 Template Editor", "📊 Template Overview"])
-
-with tab1:
+# Each tab is a fragment, so widgets inside one tab rerun only that tab
+@st.fragment
+def _render_bulk_tab():
+    """Bulk export and import of all templates"""
+    # One lookup of the live session dict per run, shared by everything in the tab
+    base_templates = template_manager.base_templates
+    generation_templates = template_generator.generation_templates
     st.header("📤 Bulk Export & Import All Templates")
     st.markdown("Export or import **all base and generation templates** in a single operation.")
     
@@ -169,42 +329,26 @@ with tab1:
         # Sync any session state changes to template generator before export
         _sync_session_templates_to_generator(template_generator)
         
-        # Prepare combined export data
-        combined_export = {
-            "metadata": {
-                "export_date": datetime.now().isoformat(),
-                "export_tool": "RAD Template Management - Bulk Export",
-                "base_template_count": len(template_manager.base_templates),
-                "generation_template_count": len(template_generator.generation_templates),
-                "total_template_count": len(template_manager.base_templates) + len(template_generator.generation_templates)
-            },
-            "base_templates": [],
-            "generation_templates": []
-        }
-        
-        # Add base templates
-        for template_name, template_content in template_manager.base_templates.items():
-            combined_export["base_templates"].append({
-                "name": template_name,
-                "content": template_content
-            })
-        
-        # Add generation templates
-        for template_name, template_content in template_generator.generation_templates.items():
-            combined_export["generation_templates"].append({
-                "name": template_name,
-                "content": template_content
-            })
-        
-        # Convert to JSON string
-        json_str = json.dumps(combined_export, indent=2)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"all_templates_export_{timestamp}.json"
+        # Unchanged template objects keep the previous export and its encoded JSON
+        fingerprint = hash((
+            tuple((name, id(template)) for name, template in base_templates.items()),
+            tuple((name, id(template)) for name, template in generation_templates.items())
+        ))
+        cached_export = st.session_state.get('template_export')
+        if cached_export is not None and cached_export[0] == fingerprint:
+            _, combined_export, export_bytes, preview_markdown, filename = cached_export
+        else:
+            combined_export, export_bytes = _build_combined_export(template_manager, template_generator)
+            preview_markdown = _export_preview_markdown(combined_export)
+            # Stamped when the export is built, so the download button is not re-sent every second
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"all_templates_export_{timestamp}.json"
+            st.session_state['template_export'] = (fingerprint, combined_export, export_bytes, preview_markdown, filename)
         
-        if template_manager.base_templates or template_generator.generation_templates:
+        if base_templates or generation_templates:
             st.download_button(
                 label=f"📥 Download All Templates ({combined_export['metadata']['total_template_count']} total)",
-                data=json_str,
+                data=export_bytes,
                 file_name=filename,
                 mime="application/json",
                 use_container_width=True,
@@ -215,12 +359,8 @@ with tab1:
             # Show export preview
             with st.expander("🔍 Export Preview", expanded=False):
                 st.json(combined_export["metadata"])
-                st.write(f"**Base Templates ({len(combined_export['base_templates'])}):**")
-                for template in combined_export["base_templates"]:
-                    st.write(f"• {template['name']}")
-                st.write(f"**Generation Templates ({len(combined_export['generation_templates'])}):**")
-                for template in combined_export["generation_templates"]:
-                    st.write(f"• {template['name']}")
+                for section_markdown in preview_markdown:
+                    st.markdown(section_markdown)
         else:
             st.info("No templates in session to export")
     
@@ -236,11 +376,27 @@ with tab1:
             key="bulk_template_uploader"
         )
         
-        if uploaded_file is not None:
+        if uploaded_file is None:
+            st.session_state.pop('pending_template_import', None)
+        else:
             try:
-                # Read the uploaded file
-                content = uploaded_file.read().decode('utf-8')
-                parsed_data = json.loads(content)
+                # Parse each upload once; reruns for the preview and the Import click reuse the result
+                pending = st.session_state.get('pending_template_import')
+                if pending is not None and pending[0] == uploaded_file.file_id:
+                    _, parsed_data, parse_error = pending
+                else:
+                    # orjson parses straight from the upload buffer, no bytes copy or UTF-8 decode pass
+                    parsed_data, parse_error = None, None
+                    try:
+                        parsed_data = _loads(uploaded_file.getbuffer())
+                    except orjson.JSONDecodeError as e:
+                        # Kept too, so a file that is not valid JSON is not re-parsed on every rerun
+                        parse_error = f"Invalid JSON format: {str(e)}"
+                    st.session_state['pending_template_import'] = (uploaded_file.file_id, parsed_data, parse_error)
+                
+                if parse_error:
+                    st.error(parse_error)
+                    st.stop()
                 
                 # Validate structure
                 has_base = "base_templates" in parsed_data and isinstance(parsed_data["base_templates"], list)
@@ -258,21 +414,20 @@ with tab1:
                 
                 # Show template preview with conflict detection
                 with st.expander("🔍 Preview Templates", expanded=True):
+                    # One markdown element per section instead of one per template
                     if has_base and base_count > 0:
-                        st.write("**Base Templates:**")
-                        for template in parsed_data["base_templates"]:
-                            if isinstance(template, dict) and "name" in template:
-                                exists = template["name"] in template_manager.base_templates
-                                status = "⚠️ Will overwrite" if exists else "✅ New"
-                                st.write(f"• **{template['name']}** {status}")
+                        st.markdown("\n".join(["**Base Templates:**", ""] + [
+                            f"- **{template['name']}** {'⚠️ Will overwrite' if template['name'] in base_templates else '✅ New'}"
+                            for template in parsed_data["base_templates"]
+                            if isinstance(template, dict) and "name" in template
+                        ]))
                     
                     if has_gen and gen_count > 0:
-                        st.write("**Generation Templates:**")
-                        for template in parsed_data["generation_templates"]:
-                            if isinstance(template, dict) and "name" in template:
-                                exists = template["name"] in template_generator.generation_templates
-                                status = "⚠️ Will overwrite" if exists else "✅ New"
-                                st.write(f"• **{template['name']}** {status}")
+                        st.markdown("\n".join(["**Generation Templates:**", ""] + [
+                            f"- **{template['name']}** {'⚠️ Will overwrite' if template['name'] in generation_templates else '✅ New'}"
+                            for template in parsed_data["generation_templates"]
+                            if isinstance(template, dict) and "name" in template
+                        ]))
                 
                 # Import options
                 overwrite_existing = st.checkbox("Overwrite existing templates", value=True, 
@@ -298,7 +453,7 @@ with tab1:
                                     template_content = template_data["content"]
                                     
                                     # Check if exists and overwrite setting
-                                    if template_name in template_manager.base_templates and not overwrite_existing:
+                                    if template_name in base_templates and not overwrite_existing:
                                         skipped_base.append(template_name)
                                         continue
                                     
@@ -321,16 +476,15 @@ with tab1:
                                     template_content = template_data["content"]
                                     
                                     # Check if exists and overwrite setting
-                                    if template_name in template_generator.generation_templates and not overwrite_existing:
+                                    if template_name in generation_templates and not overwrite_existing:
                                         skipped_gen.append(template_name)
                                         continue
                                     
                                     # Save template to generator
-                                    template_generator.generation_templates[template_name] = template_content
+                                    generation_templates[template_name] = template_content
                                     
                                     # Sync to session state for editor
-                                    content_key = f"template_content_{template_name}"
-                                    st.session_state[content_key] = json.dumps(template_content, indent=2)
+                                    _store_generation_template_json(template_name, template_content)
                                     
                                     imported_gen.append(template_name)
                                 except Exception as e:
@@ -346,49 +500,45 @@ with tab1:
                         
                         if imported_base:
                             with st.expander("Imported Base Templates"):
-                                for name in imported_base:
-                                    st.write(f"• {name}")
+                                st.markdown("\n".join(f"- {name}" for name in imported_base))
                         
                         if imported_gen:
                             with st.expander("Imported Generation Templates"):
-                                for name in imported_gen:
-                                    st.write(f"• {name}")
+                                st.markdown("\n".join(f"- {name}" for name in imported_gen))
                     
                     if total_skipped > 0:
                         st.warning(f"⚠️ Skipped {total_skipped} existing templates ({len(skipped_base)} base + {len(skipped_gen)} generation)")
                         
                         if skipped_base:
                             with st.expander("Skipped Base Templates"):
-                                for name in skipped_base:
-                                    st.write(f"• {name}")
+                                st.markdown("\n".join(f"- {name}" for name in skipped_base))
                         
                         if skipped_gen:
                             with st.expander("Skipped Generation Templates"):
-                                for name in skipped_gen:
-                                    st.write(f"• {name}")
+                                st.markdown("\n".join(f"- {name}" for name in skipped_gen))
                     
                     if errors:
                         st.error(f"❌ {len(errors)} errors occurred during import")
                         with st.expander("View Errors"):
-                            for error in errors:
-                                st.write(f"• {error}")
+                            st.markdown("\n".join(f"- {error}" for error in errors))
                     
                     if total_imported > 0:
                         st.rerun()
                         
-            except json.JSONDecodeError as e:
-                st.error(f"Invalid JSON format: {str(e)}")
             except Exception as e:
                 st.error(f"Error processing file: {str(e)}")
 
-with tab2:
+@st.fragment
+def _render_editor_tab():
+    """Base template editor and template creation"""
+    base_templates = template_manager.base_templates
     st.header("📝 Base Template Editor")
     
-    if template_manager.base_templates:
+    if base_templates:
         # Template selector
         selected_template = st.selectbox(
             "Select template to edit:",
-            options=list(template_manager.base_templates.keys()),
+            options=_sorted_template_names(base_templates, 'base_template_names_sorted'),
             help="Choose a template to view or edit (session only)"
         )
         
@@ -399,14 +549,15 @@ with tab2:
             col1, col2, col3 = st.columns(3)
             
             with col1:
-                if st.button("📥 Download Template", use_container_width=True):
-                    template_json = json.dumps(template_manager.base_templates[selected_template], indent=2)
-                    st.download_button(
-                        label="💾 Save JSON File",
-                        data=template_json,
-                        file_name=f"{selected_template}.json",
-                        mime="application/json"
-                    )
+                # Encoded only when clicked, straight to the bytes that are sent
+                st.download_button(
+                    label="📥 Download Template",
+                    data=partial(orjson.dumps, base_templates[selected_template],
+                                 option=orjson.OPT_INDENT_2),
+                    file_name=f"{selected_template}.json",
+                    mime="application/json",
+                    use_container_width=True
+                )
             
             with col2:
                 if st.button("🗑️ Delete Template", use_container_width=True, type="secondary"):
@@ -441,34 +592,42 @@ with tab2:
                 st.metric("Type", template_info.get('structure_type', 'Unknown'))
             
             # JSON editor
-            template_content = template_manager.base_templates[selected_template]
+            template_content = base_templates[selected_template]
             
-            # Use text area for editing
-            json_str = json.dumps(template_content, indent=2)
-            edited_json = st.text_area(
-                "Template JSON:",
+            # Ace edits locally and only sends the JSON back when applied, not on every keystroke
+            json_str = _pretty_template_json(selected_template, template_content)
+            st.caption("Template JSON: apply your edits with Ctrl+Enter (or the Apply button) before saving")
+            edited_json = st_ace(
                 value=json_str,
+                language='json',
+                theme=st.session_state.get('ace_theme', 'github'),
                 height=400,
-                help="Edit the template JSON structure"
+                auto_update=False,
+                wrap=True,
+                key=f"ace_{selected_template}"
             )
             
             # Save changes button
             if st.button("💾 Save Changes", type="primary"):
-                try:
-                    # Parse and validate the edited JSON
-                    new_template_content = json.loads(edited_json)
-                      # Save the template to session
-                    if template_manager.save_template(selected_template, new_template_content):
-                        mark_config_updated()
-                        st.success(f"Template '{selected_template}' saved to session")
-                        st.rerun()
-                    else:
-                        st.error("Failed to save template to session")
+                if edited_json == json_str:
+                    # Unapplied edits never reach the script, so there is nothing new to save yet
+                    st.info("No applied changes to save. Press Ctrl+Enter in the editor to apply your edits, then save.")
+                else:
+                    try:
+                        # Parse and validate the edited JSON
+                        new_template_content = _loads(edited_json)
+                          # Save the template to session
+                        if template_manager.save_template(selected_template, new_template_content):
+                            mark_config_updated()
+                            st.success(f"Template '{selected_template}' saved to session")
+                            st.rerun()
+                        else:
+                            st.error("Failed to save template to session")
                         
-                except json.JSONDecodeError as e:
-                    st.error(f"Invalid JSON: {str(e)}")
-                except Exception as e:
-                    st.error(f"Error saving template: {str(e)}")
+                    except orjson.JSONDecodeError as e:
+                        st.error(f"Invalid JSON: {str(e)}")
+                    except Exception as e:
+                        st.error(f"Error saving template: {str(e)}")
     
     else:
         st.info("No templates in session. Import some templates to get started.")
@@ -491,10 +650,10 @@ with tab2:
             if new_template_name and new_template_content:
                 try:
                     # Validate JSON
-                    parsed_content = json.loads(new_template_content)
+                    parsed_content = _loads(new_template_content)
                     
                     # Check if template already exists in session
-                    if new_template_name in template_manager.base_templates:
+                    if new_template_name in base_templates:
                         st.error(f"Template '{new_template_name}' already exists in session")
                     else:
                         # Create the template in session
@@ -505,32 +664,52 @@ with tab2:
                         else:
                             st.error("Failed to create template in session")
                             
-                except json.JSONDecodeError as e:
+                except orjson.JSONDecodeError as e:
                     st.error(f"Invalid JSON: {str(e)}")
                 except Exception as e:
                     st.error(f"Error creating template: {str(e)}")
             else:
                 st.error("Please provide both template name and content")
 
-with tab3:
+@st.fragment
+def _render_overview_tab():
+    """Overview metrics and details of the base templates"""
+    base_templates = template_manager.base_templates
     st.header("📊 Template Overview")
     
-    if template_manager.base_templates:
-        # Summary metrics
+    if base_templates:
+        # Create a table of template information, filling its columns in one pass over the cached info
+        template_names = _sorted_template_names(base_templates, 'base_template_names_sorted')
+        # Looked up once per render and shared by the table, the metrics and the detail expanders
+        template_infos = {name: template_manager.get_template_info(name) for name in template_names}
+        types, field_counts, sizes = [], [], []
+        for info in template_infos.values():
+            types.append(info.get("structure_type", "Unknown"))
+            field_counts.append(info.get("field_count", 0))
+            sizes.append(info.get("size_bytes", 0))
+        # Arrow table straight from the columns, st.dataframe ships it without a pandas round trip
+        template_data = pa.table({
+            "Name": template_names,
+            "Type": types,
+            "Fields/Items": field_counts,
+            "Size (bytes)": sizes
+        })
+        
+        # Summary metrics, reduced from the table columns; only object templates count towards fields
+        total_size = pc.sum(template_data["Size (bytes)"]).as_py()
+        total_fields = pc.sum(pc.if_else(
+            pc.equal(template_data["Type"], "Object"), template_data["Fields/Items"], 0
+        )).as_py()
+        
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric("Total Templates", len(template_manager.base_templates))
+            st.metric("Total Templates", template_data.num_rows)
         
         with col2:
-            total_size = sum(len(json.dumps(template)) for template in template_manager.base_templates.values())
             st.metric("Total Size", f"{total_size:,} bytes")
         
         with col3:
-            total_fields = 0
-            for template in template_manager.base_templates.values():
-                if isinstance(template, dict):
-                    total_fields += len(template)
             st.metric("Total Fields", total_fields)
         
         with col4:
@@ -541,26 +720,14 @@ with tab3:
         # Template details table
         st.subheader("📋 Template Details")
         
-        # Create a table of template information
-        template_data = []
-        for template_name in sorted(template_manager.base_templates.keys()):
-            info = template_manager.get_template_info(template_name)
-            template_data.append({
-                "Name": template_name,
-                "Type": info.get("structure_type", "Unknown"),
-                "Fields/Items": info.get("field_count", 0),
-                "Size (bytes)": info.get("size_bytes", 0)
-            })
-        
-        if template_data:
+        if template_data.num_rows:
             st.dataframe(template_data, use_container_width=True)
         
         # Detailed view
         st.markdown("### 🔍 Detailed Template Information")
         
-        for template_name in sorted(template_manager.base_templates.keys()):
+        for template_name, info in template_infos.items():
             with st.expander(f"📄 {template_name}", expanded=False):
-                info = template_manager.get_template_info(template_name)
                 
                 col1, col2 = st.columns(2)
                 with col1:
@@ -570,18 +737,32 @@ with tab3:
                 
                 with col2:
                     if "fields" in info and info["fields"]:
-                        st.write("**Sample Fields:**")
-                        for field in info["fields"]:
-                            st.write(f"• {field}")
+                        # One markdown element per expander instead of one per sample field
+                        sample_lines = ["**Sample Fields:**", ""]
+                        sample_lines.extend(f"- {field}" for field in info["fields"])
                         if len(info.get("fields", [])) < info.get("field_count", 0):
-                            st.write(f"... and {info.get('field_count', 0) - len(info.get('fields', []))} more")
+                            sample_lines.append(f"\n... and {info.get('field_count', 0) - len(info.get('fields', []))} more")
+                        st.markdown("\n".join(sample_lines))
                 
-                # JSON preview (collapsed)
-                st.json(template_manager.base_templates[template_name])
+                # JSON preview, only serialized and sent to the browser on request
+                if st.checkbox("Show JSON", key=f"showjson_{template_name}"):
+                    st.json(base_templates[template_name])
     
     else:
         st.info("No templates loaded in session. Import or create templates to see overview.")
 
+# Main functionality tabs
+tab1, tab2, tab3 = st.tabs(["📤 Bulk Export/Import", "📝 Template Editor", "📊 Template Overview"])
+
+with tab1:
+    _render_bulk_tab()
+
+with tab2:
+    _render_editor_tab()
+
+with tab3:
+    _render_overview_tab()
+
 # Sidebar help
 with st.sidebar:
     st.markdown("### 💡 Help & Tips")
@@ -617,16 +798,19 @@ st.markdown("---")
 
 st.markdown("### 📊 Template Statistics")
 
+base_templates = template_manager.base_templates
+generation_templates = template_generator.generation_templates
+
 col1, col2, col3, col4 = st.columns(4)
 
 with col1:
-    st.metric("Base Templates", len(template_manager.base_templates))
+    st.metric("Base Templates", len(base_templates))
 
 with col2:
-    st.metric("Generation Templates", len(template_generator.generation_templates))
+    st.metric("Generation Templates", len(generation_templates))
 
 with col3:
-    total_templates = len(template_manager.base_templates) + len(template_generator.generation_templates)
+    total_templates = len(base_templates) + len(generation_templates)
     st.metric("Total Templates", total_templates)
 
 with col4:
@@ -636,26 +820,23 @@ with col4:
 col1, col2 = st.columns(2)
 
 with col1:
-    if template_manager.base_templates:
+    if base_templates:
         with st.expander("📄 Base Templates List", expanded=False):
-            for template_name in sorted(template_manager.base_templates.keys()):
-                info = template_manager.get_template_info(template_name)
-                st.write(f"• **{template_name}** ({info.get('field_count', 0)} fields)")
+            # One markdown element for the whole list instead of one per template
+            st.markdown("\n".join(
+                f"- **{template_name}** ({template_manager.get_template_info(template_name).get('field_count', 0)} fields)"
+                for template_name in _sorted_template_names(base_templates, 'base_template_names_sorted')
+            ))
     else:
         st.info("No base templates loaded")
 
 with col2:
-    if template_generator.generation_templates:
+    if generation_templates:
         with st.expander("📝 Generation Templates List", expanded=False):
-            for template_name in sorted(template_generator.generation_templates.keys()):
-                template = template_generator.generation_templates[template_name]
-                field_count = 0
-                if isinstance(template, dict):
-                    field_count += len(template.get("StaticFields", {}))
-                    field_count += len(template.get("SequenceFields", {}))
-                    field_count += len(template.get("RandomFields", {}))
-                    field_count += len(template.get("LinkedFields", {}))
-                st.write(f"• **{template_name}** ({field_count} fields)")
+            st.markdown("\n".join(
+                f"- **{template_name}** ({_generation_field_count(template_name, generation_templates[template_name])} fields)"
+                for template_name in _sorted_template_names(generation_templates, 'generation_template_names_sorted')
+            ))
     else:
         st.info("No generation templates loaded")
 
@@ -10,6 +10,8 @@ import time
 from copy import deepcopy
 from typing import Dict, List, Any
 import json
+# Log helpers live in a pandas-free module, re-exported here for the transfer scripts
+from scripts.transfer_log import write_log, log_exists, log_mtime, read_log_lines, tail_log_lines
 
 def is_production(url: str) -> bool:
     """Check if environment is production"""
@@ -38,9 +40,3 @@ def write_inv(db_name, table_name: str, response: List[Dict]):
         pass
     finally:
         conn.close()
-
-def write_log(log_file: str, log_entry: Dict[str, Any]):
-    """Append log entry to log file"""
-    with open(log_file, "a") as f:
-        json.dump(log_entry, f)
-        f.write('\n')
\ No newline at end of file
@@ -8,6 +8,8 @@ import sqlite3
 import pandas as pd
 import math
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import os
 import re
 import time
@@ -19,6 +21,7 @@ import queue
 import traceback
 
 from scripts.inventory_transfer import write_inv, write_log
+from scripts.transfer_log import DB_DIR, transfer_db_path, close_log
 from data_creation.sync_funcs import get_failed_count
 
 # API Endpoints
@@ -32,6 +35,20 @@ LPN_CREATE_EP = '/dcinventory/api/dcinventory/ilpn/createIlpnAndInventory'
 ITEM_SYNC_EP = '/item-master/api/item-master/item/v2/sync'
 PALLETIZE_EP = '/dcinventory/api/dcinventory/ilpn/palletizeLpns'
 
+# Item batches downloaded ahead of the upload side in transfer_item_batches
+ITEM_PREFETCH_BATCHES = 4
+
+def create_http_session():
+    """
+    Create a keep-alive session shared by every request of a transfer so batches
+    reuse pooled TCP/TLS connections. Retries cover connection failures and, for
+    idempotent methods only, throttling/5xx responses (POSTs are never replayed).
+    """
+    session = requests.Session()
+    retries = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+    session.mount('https://', HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=retries))
+    return session
+
 def db_writer(db_queue, db_name, db_write_done):
     """Database writer function - runs in separate thread"""
     while True:
@@ -44,10 +61,10 @@ def db_writer(db_queue, db_name, db_write_done):
         db_queue.task_done()
     db_write_done.set()
 
-def upload_batch(to_url, to_headers, log_file, data, filter_value, batch_run, total_batches, endpoint):
+def upload_batch(to_url, to_headers, log_file, data, filter_value, batch_run, total_batches, endpoint, session=requests):
     """Upload inventory batch function"""
     try:
-        res = requests.post(to_url + endpoint, headers=to_headers, json=data)
+        res = session.post(to_url + endpoint, headers=to_headers, json=data)
         write_log(log_file, {
             "timestamp": datetime.now().isoformat(),
             "status": "RUNNING",
@@ -62,10 +79,10 @@ def upload_batch(to_url, to_headers, log_file, data, filter_value, batch_run, to
         # Optionally, you could retry here or log a failure
 
 
-def palletize_lpns(to_url, to_headers, data, batch_run, total_batches, filter_value, log_file):
+def palletize_lpns(to_url, to_headers, data, batch_run, total_batches, filter_value, log_file, session=requests):
     """Palletize LPNs"""
     try:
-        res = requests.post(to_url + PALLETIZE_EP, headers=to_headers, json=data)
+        res = session.post(to_url + PALLETIZE_EP, headers=to_headers, json=data)
         write_log(log_file, {
             "timestamp": datetime.now().isoformat(),
             "status": "RUNNING",
@@ -79,23 +96,69 @@ def palletize_lpns(to_url, to_headers, data, batch_run, total_batches, filter_va
         time.sleep(20)
         # Optionally, you could retry here or log a failure
 
-def download_and_import_item_batch(from_url, from_headers, to_url, to_headers, log_file, item_batches, item_query, batch_num):
-    """Download and process items in batches"""
+def download_item_batch(from_url, from_headers, item_query, session=requests):
+    """Download one batch of items from the source environment"""
     data = {"Query": f"ItemId in ('{'\',\''.join(item_query)}')", "Size": 200}
-    res = requests.post(from_url + ITEM_SEARCH_EP, headers=from_headers, json=data)
-    data = res.json()['data']
-    res_save = requests.post(to_url + ITEM_BULK_EP, headers=to_headers, json={"data":data})
+    res = session.post(from_url + ITEM_SEARCH_EP, headers=from_headers, json=data)
+    return res.status_code, res.json()['data']
+
+def import_item_batch(to_url, to_headers, log_file, item_batches, batch_num, search_status, data, session=requests):
+    """Bulk import one downloaded batch of items into the target environment"""
+    res_save = session.post(to_url + ITEM_BULK_EP, headers=to_headers, json={"data":data})
     write_log(log_file, {
         "timestamp": datetime.now().isoformat(),
         "status": "RUNNING",
-        "message": f"Transferred item batch {batch_num+1}/{item_batches}.\nSearch: {res.status_code}, BulkImport: {res_save.status_code}. FailedCount:{get_failed_count(res_save)}",
+        "message": f"Transferred item batch {batch_num+1}/{item_batches}.\nSearch: {search_status}, BulkImport: {res_save.status_code}. FailedCount:{get_failed_count(res_save)}",
         "response_status": res_save.status_code,
         "trace": res_save.headers['cp-trace-id'],
         "env": res_save.request.url.split('/')[2],
         "response": res_save.json(),
     })
+
+def download_and_import_item_batch(from_url, from_headers, to_url, to_headers, log_file, item_batches, item_query, batch_num, session=requests):
+    """Download and process items in batches"""
+    search_status, data = download_item_batch(from_url, from_headers, item_query, session)
+    import_item_batch(to_url, to_headers, log_file, item_batches, batch_num, search_status, data, session)
     return True
 
+def transfer_item_batches(from_url, from_headers, to_url, to_headers, log_file, items, batch_size=50, progress_callback=None, session=requests):
+    """
+    Transfer items as a download/upload pipeline: a background thread downloads
+    the next batches from the source while the previous batch is imported to the target
+    """
+    item_batches = math.ceil(len(items) / batch_size)
+    download_queue = queue.Queue(maxsize=ITEM_PREFETCH_BATCHES)
+    stop_downloads = threading.Event()
+
+    def downloader():
+        try:
+            for i in range(item_batches):
+                if stop_downloads.is_set():
+                    return
+                item_query = items[batch_size*i:batch_size*(i+1)]
+                download_queue.put((i, *download_item_batch(from_url, from_headers, item_query, session)))
+        except Exception as e:
+            download_queue.put(e)  # Re-raised on the upload side
+            return
+        download_queue.put(None)  # Sentinel value to stop the upload loop
+
+    download_thread = threading.Thread(target=downloader, daemon=True)
+    download_thread.start()
+    try:
+        while (batch := download_queue.get()) is not None:
+            if isinstance(batch, Exception):
+                raise batch
+            batch_num, search_status, data = batch
+            import_item_batch(to_url, to_headers, log_file, item_batches, batch_num, search_status, data, session)
+            if progress_callback:
+                progress_callback(f"Uploaded item batch {batch_num+1}")
+    finally:
+        # Unblock the downloader if the upload side stopped early
+        stop_downloads.set()
+        while not download_queue.empty():
+            download_queue.get_nowait()
+        download_thread.join()
+
 def merge_lia_fields(inv_data, lia_data):
     """Merge MaxUomQuantity and MinUomQuantity from LIA into inventory data by ItemId and LocationId."""
     # Build a lookup for LIA data by (ItemId, LocationId)
@@ -150,7 +213,9 @@ def run_transfer_sync(config, log_file, progress_callback=None):
     Returns:
         bool: True if successful, False if failed
     """
-    db_name = log_file.replace('.json', '.db') 
+    db_name = transfer_db_path(log_file)
+    # One pooled keep-alive session for every request in this transfer
+    session = create_http_session()
     
     try:
         # Extract configuration
@@ -216,7 +281,7 @@ def run_transfer_sync(config, log_file, progress_callback=None):
             "LocationQuery": {"Query": f"{filter_type} ={filter_value} and InventoryReservationTypeId={inv_res_type}"},
             "Size": 1
         }
-        res = requests.post(from_url + INV_SEARCH_EP, headers=from_headers, json=data)
+        res = session.post(from_url + INV_SEARCH_EP, headers=from_headers, json=data)
         if request_failed(res, log_file):
             return False
 
@@ -266,7 +331,7 @@ def run_transfer_sync(config, log_file, progress_callback=None):
                 "Size": download_batch_size,
                 "Page": i
             }
-            res = requests.post(from_url + INV_SEARCH_EP, headers=from_headers, json=data)
+            res = session.post(from_url + INV_SEARCH_EP, headers=from_headers, json=data)
             write_log(log_file, {
                 "timestamp": datetime.now().isoformat(),
                 "status": "RUNNING",
@@ -282,7 +347,7 @@ def run_transfer_sync(config, log_file, progress_callback=None):
                     "Query": f"ItemId in ('{'\',\''.join(item_list)}')",
                     "Size": download_batch_size
                 }
-                lia_res = requests.post(from_url + LIA_SEARCH_EP, headers=from_headers, json=lia_data)
+                lia_res = session.post(from_url + LIA_SEARCH_EP, headers=from_headers, json=lia_data)
                 # Merge LIA data into inventory data by ItemId
                 res_data = res.json()['data']
                 lia_data_list = lia_res.json()['data']
@@ -326,11 +391,9 @@ def run_transfer_sync(config, log_file, progress_callback=None):
                 "message": f"Processing {total_items} items in {item_batches} batches",
                 "response_status": None,
                 "response": None,
-            })        # Process items synchronously instead of using concurrent.futures
-            for i in range(item_batches):
-                item_query = items[50*i:50*(i+1)]
-                download_and_import_item_batch(from_url, from_headers, to_url, to_headers, log_file, item_batches, item_query, i)
-                progress_callback(f"Uploaded item batch {i+1}")
+            })
+            # Overlap source downloads with target uploads
+            transfer_item_batches(from_url, from_headers, to_url, to_headers, log_file, items, 50, progress_callback, session)
 
         # Commented out concurrent processing to avoid errors:
         # with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
@@ -345,7 +408,7 @@ def run_transfer_sync(config, log_file, progress_callback=None):
             if progress_callback:
                 progress_callback("Syncing items and waiting 5s...")
             
-            res = requests.post(to_url + ITEM_SYNC_EP, headers=to_headers, json={})
+            res = session.post(to_url + ITEM_SYNC_EP, headers=to_headers, json={})
             write_log(log_file, {
                 "timestamp": datetime.now().isoformat(),
                 "status": "RUNNING",
@@ -402,7 +465,7 @@ def run_transfer_sync(config, log_file, progress_callback=None):
                     batch_end = min((i + 1) * upload_batch_size, total_adjustments)
                     data = out_lias[current_start:batch_end]
                     print(data)
-                    upload_batch(to_url, to_headers, log_file, data, filter_value, batch_run=i, total_batches=adjustment_batches, endpoint=CREATE_LIA_EP)
+                    upload_batch(to_url, to_headers, log_file, data, filter_value, batch_run=i, total_batches=adjustment_batches, endpoint=CREATE_LIA_EP, session=session)
                     progress_callback(f"Imported LIA batch {i+1} of {adjustment_batches}")            
             # Prepare inventory adjustment records
             if inv_res_type == 'LOCATION':
@@ -477,7 +540,7 @@ def run_transfer_sync(config, log_file, progress_callback=None):
                 current_start = i * upload_batch_size
                 batch_end = min((i + 1) * upload_batch_size, total_adjustments)
                 data = out_records[current_start:batch_end]
-                upload_batch(to_url, to_headers, log_file, data, filter_value, batch_run=i, total_batches=adjustment_batches, endpoint=endpoint)
+                upload_batch(to_url, to_headers, log_file, data, filter_value, batch_run=i, total_batches=adjustment_batches, endpoint=endpoint, session=session)
                 progress_callback(f"Imported inventory batch {i+1} of {adjustment_batches}")
 
             if inventory_type == "Palletized":
@@ -563,7 +626,7 @@ def run_transfer_sync(config, log_file, progress_callback=None):
                         current_start = i * upload_batch_size
                         batch_end = min((i + 1) * upload_batch_size, total_pallets)
                         batch_data = palletize_records[current_start:batch_end]
-                        palletize_lpns(to_url, to_headers, batch_data, batch_run=i, total_batches=palletize_batches, filter_value=filter_value, log_file=log_file)
+                        palletize_lpns(to_url, to_headers, batch_data, batch_run=i, total_batches=palletize_batches, filter_value=filter_value, log_file=log_file, session=session)
                         if progress_callback:
                             progress_callback(f"Palletized batch {i+1} of {palletize_batches}")
         # Commented out concurrent processing to avoid errors:
@@ -611,29 +674,31 @@ def run_transfer_sync(config, log_file, progress_callback=None):
             progress_callback(f"Transfer failed: {str(e)}")
         
         return False
+    
+    finally:
+        session.close()
+        close_log(log_file)
 
 def cleanup_old_files(log_file):
     """Clean up old transfer status files and database files"""
-    status_dir = os.path.dirname(log_file)
-    if not status_dir:
-        status_dir = '.'
-    
     now = time.time()
-    for fname in os.listdir(status_dir):
-        fpath = os.path.join(status_dir, fname)
-        if os.path.isfile(fpath):
-            # Clean up old JSON log files
-            if fname.startswith("transfer_status") and fname.endswith(".json"):
-                if now - os.path.getmtime(fpath) > 86400:  # 24 hours
-                    try:
-                        os.remove(fpath)
-                    except OSError:
-                        pass  # Ignore if file can't be removed
-            
-            # Clean up old database files
-            elif fname.startswith("transfer_status") and fname.endswith(".db"):
-                if now - os.path.getmtime(fpath) > 86400:  # 24 hours
-                    try:
-                        os.remove(fpath)
-                    except OSError:
-                        pass  # Ignore if file can't be removed
+    # Logs and scratch databases may live in different directories
+    for status_dir in {os.path.dirname(log_file) or '.', DB_DIR}:
+        for fname in os.listdir(status_dir):
+            fpath = os.path.join(status_dir, fname)
+            if os.path.isfile(fpath):
+                # Clean up old JSON log files
+                if fname.startswith("transfer_status") and fname.endswith(".json"):
+                    if now - os.path.getmtime(fpath) > 86400:  # 24 hours
+                        try:
+                            os.remove(fpath)
+                        except OSError:
+                            pass  # Ignore if file can't be removed
+                
+                # Clean up old database files
+                elif fname.startswith("transfer_status") and fname.endswith(".db"):
+                    if now - os.path.getmtime(fpath) > 86400:  # 24 hours
+                        try:
+                            os.remove(fpath)
+                        except OSError:
+                            pass  # Ignore if file can't be removed
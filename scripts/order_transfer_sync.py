@@ -20,6 +20,7 @@ import traceback
 from typing import Dict, List, Any
 
 from scripts.inventory_transfer import write_log
+from scripts.transfer_log import DB_DIR, transfer_db_path, close_log
 from data_creation.order_import_funcs import scrub_order_data
 from data_creation.sync_funcs import get_failed_count
 # API Endpoints
@@ -161,7 +162,7 @@ def run_transfer_sync(config, log_file, progress_callback):
     Returns:
         bool: True if successful, False if failed
     """
-    db_name = log_file.replace('.json', '.db') 
+    db_name = transfer_db_path(log_file)
     
     try:
         # Extract configuration
@@ -462,29 +463,30 @@ def run_transfer_sync(config, log_file, progress_callback):
         raise
         
         return False
+    
+    finally:
+        close_log(log_file)
 
 def cleanup_old_files(log_file):
     """Clean up old transfer status files and database files"""
-    status_dir = os.path.dirname(log_file)
-    if not status_dir:
-        status_dir = '.'
-    
     now = time.time()
-    for fname in os.listdir(status_dir):
-        fpath = os.path.join(status_dir, fname)
-        if os.path.isfile(fpath):
-            # Clean up old JSON log files
-            if fname.startswith("transfer_status") and fname.endswith(".json"):
-                if now - os.path.getmtime(fpath) > 86400:  # 24 hours
-                    try:
-                        os.remove(fpath)
-                    except OSError:
-                        pass  # Ignore if file can't be removed
-            
-            # Clean up old database files
-            elif fname.startswith("transfer_status") and fname.endswith(".db"):
-                if now - os.path.getmtime(fpath) > 86400:  # 24 hours
-                    try:
-                        os.remove(fpath)
-                    except OSError:
-                        pass  # Ignore if file can't be removed
+    # Logs and scratch databases may live in different directories
+    for status_dir in {os.path.dirname(log_file) or '.', DB_DIR}:
+        for fname in os.listdir(status_dir):
+            fpath = os.path.join(status_dir, fname)
+            if os.path.isfile(fpath):
+                # Clean up old JSON log files
+                if fname.startswith("transfer_status") and fname.endswith(".json"):
+                    if now - os.path.getmtime(fpath) > 86400:  # 24 hours
+                        try:
+                            os.remove(fpath)
+                        except OSError:
+                            pass  # Ignore if file can't be removed
+                
+                # Clean up old database files
+                elif fname.startswith("transfer_status") and fname.endswith(".db"):
+                    if now - os.path.getmtime(fpath) > 86400:  # 24 hours
+                        try:
+                            os.remove(fpath)
+                        except OSError:
+                            pass  # Ignore if file can't be removed
@@ -0,0 +1,160 @@
+"""
+Transfer log helpers
+JSON lines logs written by the transfer scripts and read by the import pages, kept free of
+pandas so the pages can poll logs without loading the transfer scripts
+"""
+
+import os
+import orjson
+import threading
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
+
+# Optional Redis list sink for transfer logs, shared by every worker and Streamlit replica
+LOG_REDIS_URL = os.getenv('TRANSFER_LOG_REDIS_URL')
+LOG_REDIS_MAX_ENTRIES = 1000
+LOG_REDIS_TTL = 86400  # 24 hours, same retention as the log file cleanup
+_log_redis = None
+
+# Transfer logs go to tmpfs (RAM backed) when available to avoid container layer writes
+LOG_DIR = os.getenv('TRANSFER_LOG_DIR', '/dev/shm' if os.path.isdir('/dev/shm') else '.')
+# Scratch databases grow with the transfer, so they stay on disk (Docker caps /dev/shm at 64 MB)
+DB_DIR = os.getenv('TRANSFER_DB_DIR', '.')
+
+# Log files are a ring buffer: once a file passes the cap by LOG_FILE_COMPACT_EVERY
+# lines it is rewritten with only the newest LOG_FILE_MAX_ENTRIES plus a summary line
+LOG_FILE_MAX_ENTRIES = 5000
+LOG_FILE_COMPACT_EVERY = 500
+_log_line_counts: Dict[str, int] = {}
+# Held around every append and compaction, so no entry lands between the read and the swap
+_log_file_lock = threading.Lock()
+
+def transfer_db_path(log_file: str) -> str:
+    """Scratch SQLite database of a transfer, kept in DB_DIR rather than next to its log"""
+    os.makedirs(DB_DIR, exist_ok=True)
+    return os.path.join(DB_DIR, os.path.basename(log_file).replace('.json', '.db'))
+
+def get_log_redis():
+    """Get the Redis client used for transfer logs, or None when logs are written to files"""
+    global _log_redis
+    if LOG_REDIS_URL and _log_redis is None:
+        import redis
+        _log_redis = redis.from_url(LOG_REDIS_URL)
+    return _log_redis
+
+def log_key(log_file: str) -> str:
+    """Redis list key for a transfer log"""
+    return f"xfer:{os.path.splitext(os.path.basename(log_file))[0]}"
+
+def write_log(log_file: str, log_entry: Dict[str, Any]):
+    """Append log entry to the transfer log (capped Redis list if configured, otherwise log file)"""
+    log_redis = get_log_redis()
+    if log_redis is not None:
+        key = log_key(log_file)
+        pipe = log_redis.pipeline()
+        pipe.lpush(key, orjson.dumps(log_entry, option=orjson.OPT_NON_STR_KEYS))
+        pipe.ltrim(key, 0, LOG_REDIS_MAX_ENTRIES - 1)
+        pipe.expire(key, LOG_REDIS_TTL)
+        pipe.execute()
+        return
+    with _log_file_lock:
+        if log_file not in _log_line_counts:
+            # First write from this process, a resumed log already holds lines that count towards the cap
+            _log_line_counts[log_file] = len(read_log_lines(log_file)) if os.path.exists(log_file) else 0
+        # One bytes write per entry, orjson output is already UTF-8 so no text layer is needed
+        with open(log_file, "ab") as f:
+            f.write(orjson.dumps(log_entry, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE))
+        line_count = _log_line_counts[log_file] + 1
+        _log_line_counts[log_file] = line_count
+        if line_count >= LOG_FILE_MAX_ENTRIES + LOG_FILE_COMPACT_EVERY:
+            _compact_log_file(log_file)
+
+def close_log(log_file: str):
+    """Forget the line count of a finished transfer's log, the file itself is left for the pages"""
+    with _log_file_lock:
+        _log_line_counts.pop(log_file, None)
+
+def _compact_log_file(log_file: str):
+    """
+    Rewrite the log file keeping only the newest entries and a running count of trimmed ones
+    
+    Called with _log_file_lock held
+    """
+    with open(log_file, 'rb') as f:
+        lines = f.read().splitlines()
+    trimmed = 0
+    if lines and b'"trimmed_entries"' in lines[0]:
+        # The previous summary line carries the running count and is replaced below
+        trimmed = orjson.loads(lines[0])['trimmed_entries']
+        lines = lines[1:]
+    kept = lines[-LOG_FILE_MAX_ENTRIES:]
+    trimmed += len(lines) - len(kept)
+    summary = orjson.dumps({
+        "timestamp": datetime.now().isoformat(),
+        "status": "RUNNING",
+        "message": f"{trimmed} earlier log entries trimmed to keep the log bounded",
+        "response_status": None,
+        "response": None,
+        "trimmed_entries": trimmed,
+    })
+    # Write to a temp file and swap so readers never see a partially written log
+    tmp_file = f"{log_file}.tmp"
+    with open(tmp_file, 'wb') as f:
+        f.write(b'\n'.join([summary, *kept]) + b'\n')
+    os.replace(tmp_file, log_file)
+    _log_line_counts[log_file] = len(kept) + 1
+
+def log_exists(log_file: str) -> bool:
+    """Check if any entries have been written to the transfer log"""
+    log_redis = get_log_redis()
+    if log_redis is not None:
+        return bool(log_redis.exists(log_key(log_file)))
+    return os.path.exists(log_file)
+
+def log_mtime(log_file: str) -> Optional[int]:
+    """Modification time (ns) of a file transfer log, None when it is missing or kept in Redis"""
+    if get_log_redis() is not None:
+        return None
+    try:
+        return os.stat(log_file).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+def read_log_lines(log_file: str) -> List[bytes]:
+    """Read the raw JSON lines of a transfer log, oldest first"""
+    log_redis = get_log_redis()
+    if log_redis is not None:
+        return log_redis.lrange(log_key(log_file), 0, -1)[::-1]
+    with open(log_file, 'rb') as f:
+        return [line for line in f.read().splitlines() if line.strip()]
+
+def tail_log_lines(log_file: str, cursor: Optional[Tuple[bytes, int]] = None) -> Tuple[List[bytes], Tuple[bytes, int], bool]:
+    """
+    Read the raw JSON lines appended to a transfer log since cursor
+    
+    Args:
+        log_file: Path to the log file
+        cursor: Position returned by the previous call, None to read from the start
+    
+    Returns:
+        The new lines, the cursor to pass next time, and whether the log was read from the
+        start (first call, compacted log or Redis log) so earlier lines must be dropped
+    """
+    log_redis = get_log_redis()
+    if log_redis is not None:
+        # Redis logs are capped at LOG_REDIS_MAX_ENTRIES, so they are always re-read whole
+        return read_log_lines(log_file), (b'', 0), True
+    with open(log_file, 'rb') as f:
+        # The leading bytes hold the first entry's timestamp, which changes whenever
+        # _compact_log_file rewrites the file with a new summary line
+        head = f.read(64)
+        last_head, offset = cursor or (head, 0)
+        restarted = cursor is None or head != last_head
+        if restarted:
+            offset = 0
+        f.seek(offset)
+        data = f.read()
+    # Only consume complete lines, a partially written last line is picked up next time
+    end = data.rfind(b'\n') + 1
+    lines = [line for line in data[:end].splitlines() if line.strip()]
+    return lines, (head, offset + end), restarted
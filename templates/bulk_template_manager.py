@@ -1,4 +1,4 @@
-import json
+import orjson
 from datetime import datetime
 from typing import Dict, Any, List, Tuple
 from data_creation.template_generator import TemplateGenerator
@@ -40,7 +40,7 @@ class BulkTemplateManager:
         # Sort templates by name for consistency
         templates_export["templates"].sort(key=lambda x: x["name"])
         
-        return json.dumps(templates_export, indent=2), templates_export
+        return orjson.dumps(templates_export, option=orjson.OPT_INDENT_2).decode(), templates_export
     
     @staticmethod
     def import_all_templates(template_generator: TemplateGenerator, 
@@ -59,8 +59,28 @@ class BulkTemplateManager:
         """
         try:
             # Parse the import data
-            parsed_data = json.loads(import_data)
+            parsed_data = orjson.loads(import_data)
+        except orjson.JSONDecodeError as e:
+            return False, f"Invalid JSON format: {str(e)}", [], []
+        
+        return BulkTemplateManager.import_parsed_templates(template_generator, parsed_data, overwrite_existing)
+    
+    @staticmethod
+    def import_parsed_templates(template_generator: TemplateGenerator, 
+                              parsed_data: Any, 
+                              overwrite_existing: bool = True) -> Tuple[bool, str, List[str], List[str]]:
+        """
+        Import generation templates from already parsed JSON into current session (no file writes)
+        
+        Args:
+            template_generator: TemplateGenerator instance
+            parsed_data: Parsed import document containing templates
+            overwrite_existing: Whether to overwrite existing templates
             
+        Returns:
+            Tuple of (success, message, imported_templates, skipped_templates)
+        """
+        try:
             # Validate structure
             if not isinstance(parsed_data, dict):
                 return False, "Invalid format: Root must be an object", [], []
@@ -117,8 +137,6 @@ class BulkTemplateManager:
             
             return True, message, imported_templates, skipped_templates
             
-        except json.JSONDecodeError as e:
-            return False, f"Invalid JSON format: {str(e)}", [], []
         except Exception as e:
             return False, f"Import error: {str(e)}", [], []
     
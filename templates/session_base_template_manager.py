@@ -4,7 +4,7 @@ Handles base API templates in session memory only - no server-side storage
 Loads read-only examples from disk on startup, but all modifications are session-only
 """
 
-import json
+import orjson
 import os
 import glob
 import streamlit as st
@@ -19,12 +19,16 @@ class SessionBaseTemplateManager:
         self.templates_dir = templates_dir
         self.session_key = "session_base_templates"
         self.examples_loaded_key = "session_base_examples_loaded"
+        self.info_cache_key = "session_base_template_info"
+        self.disk_cache_key = "session_base_example_files"
         self._ensure_session_initialized()
     
     def _ensure_session_initialized(self):
         """Ensure session state is initialized and load examples if needed"""
         if self.session_key not in st.session_state:
             st.session_state[self.session_key] = {}
+        if self.info_cache_key not in st.session_state:
+            st.session_state[self.info_cache_key] = {}
         
         # Load read-only examples on first initialization
         if not st.session_state.get(self.examples_loaded_key, False):
@@ -39,11 +43,19 @@ class SessionBaseTemplateManager:
         # Load all JSON files from templates directory as read-only examples
         template_files = glob.glob(os.path.join(self.templates_dir, "*.json"))
         
+        # {path: (mtime_ns, size, parsed data)}, files unchanged since the last load are not re-read
+        disk_cache = st.session_state.setdefault(self.disk_cache_key, {})
+        
         for file_path in template_files:
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    template_data = json.loads(content)
+                stat = os.stat(file_path)
+                cached = disk_cache.get(file_path)
+                if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+                    template_data = cached[2]
+                else:
+                    with open(file_path, 'rb') as f:
+                        template_data = orjson.loads(f.read())
+                    disk_cache[file_path] = (stat.st_mtime_ns, stat.st_size, template_data)
                     
                 # Use filename (without extension) as template name
                 template_name = os.path.splitext(os.path.basename(file_path))[0]
@@ -59,20 +71,32 @@ class SessionBaseTemplateManager:
         self._ensure_session_initialized()
         return st.session_state[self.session_key]
     
+    def _invalidate_info_cache(self):
+        """Drop cached template info after templates change"""
+        st.session_state[self.info_cache_key] = {}
+    
     def load_templates(self):
-        """Reload examples from disk into session (useful for refresh)"""
+        """
+        Reload examples from disk into session (useful for refresh)
+        
+        Examples edited in the session are reset to their disk version, files whose
+        modification time and size are unchanged reuse the data parsed last time.
+        """
         self._load_examples_to_session()
+        self._invalidate_info_cache()
     
     def clear_all_templates(self):
         """Clear all templates from session"""
         self._ensure_session_initialized()
         st.session_state[self.session_key] = {}
+        self._invalidate_info_cache()
     
     def save_template(self, template_name: str, template_content: Any) -> bool:
         """Save template to session memory only"""
         try:
             self._ensure_session_initialized()
             st.session_state[self.session_key][template_name] = template_content
+            self._invalidate_info_cache()
             return True
         except Exception as e:
             st.error(f"Error saving template {template_name} to session: {str(e)}")
@@ -84,6 +108,7 @@ class SessionBaseTemplateManager:
             self._ensure_session_initialized()
             if template_name in st.session_state[self.session_key]:
                 del st.session_state[self.session_key][template_name]
+            self._invalidate_info_cache()
             return True
         except Exception as e:
             st.error(f"Error deleting template {template_name}: {str(e)}")
@@ -114,14 +139,21 @@ class SessionBaseTemplateManager:
         # Sort templates by name for consistency
         templates_export["templates"].sort(key=lambda x: x["name"])
         
-        return json.dumps(templates_export, indent=2), templates_export
+        return orjson.dumps(templates_export, option=orjson.OPT_INDENT_2).decode(), templates_export
     
     def import_templates(self, import_data: str, overwrite_existing: bool = True) -> Tuple[bool, str, List[str], List[str]]:
         """Import base templates from JSON string into session memory only"""
         try:
             # Parse the import data
-            parsed_data = json.loads(import_data)
-            
+            parsed_data = orjson.loads(import_data)
+        except orjson.JSONDecodeError as e:
+            return False, f"Invalid JSON format: {str(e)}", [], []
+        
+        return self.import_parsed_templates(parsed_data, overwrite_existing)
+    
+    def import_parsed_templates(self, parsed_data: Any, overwrite_existing: bool = True) -> Tuple[bool, str, List[str], List[str]]:
+        """Import base templates from already parsed JSON into session memory only"""
+        try:
             # Validate structure
             if not isinstance(parsed_data, dict):
                 return False, "Invalid format: Root must be an object", [], []
@@ -168,20 +200,28 @@ class SessionBaseTemplateManager:
             
             return True, message, imported_templates, skipped_templates
             
-        except json.JSONDecodeError as e:
-            return False, f"Invalid JSON format: {str(e)}", [], []
         except Exception as e:
             return False, f"Import error: {str(e)}", [], []
     
     def get_template_info(self, template_name: str) -> Dict[str, Any]:
-        """Get detailed information about a template"""
+        """
+        Get detailed information about a template
+        
+        Results are cached in session state against the template object they describe and
+        dropped whenever templates are saved, deleted, cleared or reloaded.
+        """
         if template_name not in self.base_templates:
             return {}
         
         template = self.base_templates[template_name]
+        info_cache = st.session_state[self.info_cache_key]
+        cached = info_cache.get(template_name)
+        if cached is not None and cached[0] is template:
+            return cached[1]
         
         info = {
-            "size_bytes": len(json.dumps(template)),
+            # Compact UTF-8 size, orjson returns bytes so no str is built just to measure it
+            "size_bytes": len(orjson.dumps(template)),
             "structure_type": "Object" if isinstance(template, dict) else "Array" if isinstance(template, list) else "Other"
         }
         
@@ -196,4 +236,5 @@ class SessionBaseTemplateManager:
             info["field_count"] = 0
             info["fields"] = []
         
+        info_cache[template_name] = (template, info)
         return info